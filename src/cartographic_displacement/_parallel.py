@@ -0,0 +1,43 @@
+"""
+Thread-pool helper shared by the vectorized Shapely stages.
+
+Shapely releases the GIL inside its vectorized functions, so large inputs
+can be split into contiguous chunks that are processed on a thread pool.
+Threads avoid pickling geometries across process boundaries.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Sequence
+import os
+import numpy as np
+
+
+def map_chunks(func: Callable[..., np.ndarray], arrays: Sequence[np.ndarray],
+               min_size: int) -> np.ndarray:
+    """
+    Apply a vectorized function to aligned arrays, in parallel for large inputs.
+    
+    Inputs shorter than min_size, or machines with a single CPU, are handled
+    in one call. Otherwise the arrays are split into one contiguous chunk per
+    CPU, and the per-chunk results are concatenated back in their original
+    order.
+    
+    Args:
+        func: Function of the arrays, returning one result row per element
+        arrays: Arrays of equal length, passed to func as positional arguments
+        min_size: Smallest input length that is split across threads
+    
+    Returns:
+        Array of func's results, one per element, in input order
+    """
+    workers = os.cpu_count() or 1
+    if workers == 1 or len(arrays[0]) < min_size:
+        return func(*arrays)
+    
+    chunks = np.array_split(np.arange(len(arrays[0])), workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(
+            lambda idx: func(*(array[idx] for array in arrays)),
+            chunks
+        ))
+    return np.concatenate(parts)
@@ -5,13 +5,37 @@ This module provides functionality to detect segments that violate
 minimum distance constraints in a street network.
 """
 
-from typing import List
-from shapely.geometry import Point as ShapelyPoint
+from typing import Dict, FrozenSet, List, Optional, Set
+from collections import defaultdict
+from itertools import combinations
+import numpy as np
+import shapely
+from shapely.strtree import STRtree
 
+from ._parallel import map_chunks
 from .models import Conflict, Point, LineSegment
 from .network_graph import NetworkGraph
 
 
+# Candidate sets at least this large are solved across worker threads
+PARALLEL_MIN_PAIRS = 20_000
+
+
+def _shortest_line_endpoints(geoms_a: np.ndarray, geoms_b: np.ndarray) -> np.ndarray:
+    """
+    Compute the endpoints of the shortest line between paired geometries.
+    
+    Args:
+        geoms_a: Object array of first geometries
+        geoms_b: Object array of second geometries, same length as geoms_a
+        
+    Returns:
+        Array of shape (n, 2, 2): closest point on geoms_a, then on geoms_b
+    """
+    lines = shapely.shortest_line(geoms_a, geoms_b)
+    return shapely.get_coordinates(lines).reshape(-1, 2, 2)
+
+
 class ConflictDetector:
     """
     Detector for spatial conflicts between line segments.
@@ -22,7 +46,12 @@ class ConflictDetector:
     Attributes:
         network: The NetworkGraph to analyze
         min_distance: Minimum allowed distance between segments
-        _conflicts: Cached list of detected conflicts
+        _conflicts: Cached list of detected conflicts, None until detection runs
+        _geometries: Object array of segment geometries, aligned with network.segments
+        _spatial_index: Bulk-loaded R-tree over segment geometries used as
+                        a broad phase to prune candidate pairs
+        _indexed_segments: Copy of the segment list the R-tree was built
+                           from, None until the first detection
     """
     
     def __init__(self, network: NetworkGraph, min_distance: float):
@@ -34,76 +63,146 @@ class ConflictDetector:
             min_distance: Minimum allowed distance between segments
             
         Raises:
-            ValueError: If min_distance is not positive
+            ValueError: If min_distance is not positive (or is NaN)
         """
-        if min_distance <= 0:
+        # Written as a single positive test so NaN is rejected too; the
+        # message is only formatted on the failing path
+        if not min_distance > 0:
             raise ValueError(f"min_distance must be positive, got {min_distance}")
         
         self.network = network
         self.min_distance = min_distance
-        self._conflicts: List[Conflict] = []
+        self._conflicts: Optional[List[Conflict]] = None
+        self._geometries = np.empty(0, dtype=object)
+        self._spatial_index: Optional[STRtree] = None
+        self._indexed_segments: Optional[List[LineSegment]] = None
     
     def detect_conflicts(self) -> List[Conflict]:
         """
         Return all segment pairs violating minimum distance.
         
-        This method checks all segment pairs, computes actual distances and
-        excludes adjacent segments.
+        This method uses the R-tree as a broad phase: only segment pairs whose
+        bounding boxes lie within min_distance of each other are candidates.
+        Adjacent segments are excluded, the exact distance of every remaining
+        candidate is computed in a single vectorized Shapely call, and the
+        closest points are then found for the violating pairs only.
         
         Returns:
             List of Conflict objects representing spatial conflicts
         """
         conflicts = []
+        segments = self.network.segments
+        self._update_spatial_index(segments)
+        geoms = self._geometries
+        
+        # Get adjacency information to exclude adjacent segments in a single
+        # pass over the intersections (segments meeting there are adjacent)
+        adjacent_map: Dict[int, Set[int]] = defaultdict(set)
+        for intersection in self.network.get_intersections():
+            for a, b in combinations(intersection.connected_segment_ids, 2):
+                adjacent_map[a].add(b)
+                adjacent_map[b].add(a)
+        
+        # Broad phase: query every bounding box expanded by min_distance at once,
+        # so every segment closer than min_distance is guaranteed to be returned
+        bounds = np.array([seg.bounds for seg in segments], dtype=np.float64).reshape(-1, 4)
+        expanded = shapely.box(
+            bounds[:, 0] - self.min_distance,
+            bounds[:, 1] - self.min_distance,
+            bounds[:, 2] + self.min_distance,
+            bounds[:, 3] + self.min_distance
+        )
+        i_arr, j_arr = self._spatial_index.query(expanded)
+        
+        # Each unordered pair is checked once, in the same order as a pair scan
+        keep = i_arr < j_arr
+        i_arr, j_arr = i_arr[keep], j_arr[keep]
+        order = np.lexsort((j_arr, i_arr))
+        i_arr, j_arr = i_arr[order], j_arr[order]
+        
+        # The expanded boxes overlap on each axis, but their corners can still
+        # be farther apart than min_distance; drop those pairs with a pure
+        # array test on the box-to-box gap before any GEOS work. A gap of
+        # exactly min_distance is kept: GEOS may still measure the pair as
+        # closer through rounding, and its distance decides
+        bmin, bmax = bounds[:, :2], bounds[:, 2:]
+        gap = np.maximum(
+            np.maximum(bmin[j_arr] - bmax[i_arr], bmin[i_arr] - bmax[j_arr]), 0.0
+        )
+        near = (gap * gap).sum(axis=1) <= self.min_distance * self.min_distance
+        i_arr, j_arr = i_arr[near], j_arr[near]
+        
+        # Skip pairs of adjacent segments (sharing an endpoint). Neighbour sets
+        # are looked up once per segment position rather than once per pair
+        empty: FrozenSet[int] = frozenset()
+        ids = [seg.id for seg in segments]
+        adjacent_by_index = [
+            frozenset(adjacent_map[seg_id]) if seg_id in adjacent_map else empty
+            for seg_id in ids
+        ]
+        not_adjacent = np.fromiter(
+            (ids[j] not in adjacent_by_index[i]
+             for i, j in zip(i_arr.tolist(), j_arr.tolist())),
+            dtype=bool,
+            count=len(i_arr)
+        )
+        i_arr, j_arr = i_arr[not_adjacent], j_arr[not_adjacent]
         
-        # Get adjacency information to exclude adjacent segments
-        adjacent_map = {}
-        for segment in self.network.segments:
-            adjacent_segments = self.network.get_adjacent_segments(segment)
-            adjacent_map[segment.id] = set(s.id for s in adjacent_segments)
-        
-        # Check all pairs of segments
-        checked_pairs = set()
-        
-        for i, segment in enumerate(self.network.segments):
-            for j in range(i + 1, len(self.network.segments)):
-                other_segment = self.network.segments[j]
-                
-                # Skip if segments are adjacent (share an endpoint)
-                if other_segment.id in adjacent_map.get(segment.id, set()):
-                    continue
-                
-                # Calculate actual distance between segments
-                distance = segment.shapely_geom.distance(other_segment.shapely_geom)
-                
-                # If distance violates minimum, create conflict
-                if distance < self.min_distance:
-                    # Find closest points on each segment
-                    from shapely.ops import nearest_points
-                    
-                    point1_shapely, point2_shapely = nearest_points(
-                        segment.shapely_geom,
-                        other_segment.shapely_geom
-                    )
-                    
-                    point1 = Point(point1_shapely.x, point1_shapely.y)
-                    point2 = Point(point2_shapely.x, point2_shapely.y)
-                    
-                    required_displacement = self.min_distance - distance
-                    
-                    conflict = Conflict(
-                        segment1=segment,
-                        segment2=other_segment,
-                        min_distance_point1=point1,
-                        min_distance_point2=point2,
-                        actual_distance=distance,
-                        required_displacement=required_displacement
-                    )
-                    
-                    conflicts.append(conflict)
+        # Test the threshold on GEOS's exact distance; distances rebuilt from
+        # shortest-line endpoints carry rounding error, which would report
+        # segments exactly min_distance apart as conflicts
+        distances = map_chunks(
+            shapely.distance, (geoms[i_arr], geoms[j_arr]), PARALLEL_MIN_PAIRS
+        )
+        violating = distances < self.min_distance
+        i_arr, j_arr = i_arr[violating], j_arr[violating]
+        distances = distances[violating]
+        
+        # Only the violating pairs need their closest points: the endpoints
+        # of the shortest connecting line
+        endpoints = map_chunks(
+            _shortest_line_endpoints, (geoms[i_arr], geoms[j_arr]), PARALLEL_MIN_PAIRS
+        )
+        
+        # Materialize all closest points in one bulk pass: rows alternate
+        # between the point on segment i and the point on segment j
+        closest = Point.from_array(endpoints)
+        
+        for k, (i, j, distance) in enumerate(
+            zip(i_arr.tolist(), j_arr.tolist(), distances.tolist())
+        ):
+            conflict = Conflict(
+                segment1=segments[i],
+                segment2=segments[j],
+                min_distance_point1=closest[2 * k],
+                min_distance_point2=closest[2 * k + 1],
+                actual_distance=distance,
+                required_displacement=self.min_distance - distance
+            )
+            conflicts.append(conflict)
         
         self._conflicts = conflicts
         return conflicts
     
+    def _update_spatial_index(self, segments: List[LineSegment]) -> None:
+        """
+        Bulk-load the R-tree over the segments, unless it already covers them.
+        
+        The tree is reused across detections while the network's segment
+        list is unchanged; list comparison checks element identity first, so
+        an unchanged list is recognized without comparing any geometry.
+        
+        Args:
+            segments: Current segment list of the network
+        """
+        if self._spatial_index is not None and self._indexed_segments == segments:
+            return
+        
+        # Positional indices of the tree match the segment list
+        self._geometries = np.array([seg.shapely_geom for seg in segments], dtype=object)
+        self._spatial_index = STRtree(self._geometries)
+        self._indexed_segments = list(segments)
+    
     def get_conflict_zones(self) -> List:
         """
         Return geometric regions containing conflicts.
@@ -114,20 +213,23 @@ class ConflictDetector:
         Returns:
             List of Shapely Polygon objects representing conflict zones
         """
-        if not self._conflicts:
+        if self._conflicts is None:
             self.detect_conflicts()
         
-        zones = []
-        for conflict in self._conflicts:
-            # Create a buffer around the conflict midpoint
-            midpoint_x = (conflict.min_distance_point1.x + conflict.min_distance_point2.x) / 2
-            midpoint_y = (conflict.min_distance_point1.y + conflict.min_distance_point2.y) / 2
-            
-            midpoint = ShapelyPoint(midpoint_x, midpoint_y)
-            zone = midpoint.buffer(self.min_distance / 2)
-            zones.append(zone)
+        # Create a buffer around every conflict midpoint in one call. Zones are
+        # only used for visualization, so a coarse circle (4 segments per
+        # quarter) is enough and much cheaper to tessellate than the default
+        midpoints = np.array(
+            [((c.min_distance_point1.x + c.min_distance_point2.x) / 2,
+              (c.min_distance_point1.y + c.min_distance_point2.y) / 2)
+             for c in self._conflicts],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        zones = shapely.buffer(
+            shapely.points(midpoints), self.min_distance / 2, quad_segs=4
+        )
         
-        return zones
+        return zones.tolist()
     
     def get_conflicts_for_segment(self, segment: LineSegment) -> List[Conflict]:
         """
@@ -139,7 +241,7 @@ class ConflictDetector:
         Returns:
             List of Conflict objects involving the given segment
         """
-        if not self._conflicts:
+        if self._conflicts is None:
             self.detect_conflicts()
         
         segment_conflicts = []
@@ -156,7 +258,7 @@ class ConflictDetector:
         Returns:
             Number of conflicts
         """
-        if not self._conflicts:
+        if self._conflicts is None:
             self.detect_conflicts()
         
         return len(self._conflicts)
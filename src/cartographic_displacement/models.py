@@ -8,18 +8,30 @@ throughout the system.
 from dataclasses import dataclass, field
 from typing import List, Optional
 from shapely.geometry import LineString
+import numpy as np
 import math
 
 
-@dataclass
+# Points are hashed on an integer grid of 1e-6 units; rounding the scaled
+# float to an int avoids the decimal-string path of round(x, ndigits)
+_HASH_SCALE = 1_000_000
+_EQ_TOLERANCE = 1e-6
+
+
+@dataclass(frozen=True)
 class Point:
     """
     A 2D point in Cartesian coordinates.
     
+    Points are immutable and slotted: they are created in bulk on the hot
+    paths (parsing, conflict detection), so they carry no per-instance dict.
+    
     Attributes:
         x: X-coordinate
         y: Y-coordinate
     """
+    __slots__ = ('x', 'y')
+    
     x: float
     y: float
     
@@ -33,30 +45,82 @@ class Point:
         Returns:
             The Euclidean distance between the two points
         """
-        return math.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2)
+        return math.sqrt(self.distance_to_squared(other))
+    
+    def distance_to_squared(self, other: 'Point') -> float:
+        """
+        Calculate squared Euclidean distance to another point.
+        
+        Cheaper than distance_to when the value is only used for ranking
+        or threshold comparisons.
+        
+        Args:
+            other: The other point
+            
+        Returns:
+            The squared Euclidean distance between the two points
+        """
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
+    
+    @classmethod
+    def from_array(cls, xy: np.ndarray) -> List['Point']:
+        """
+        Create points in bulk from an (n, 2) coordinate array.
+        
+        Writes the slots directly instead of going through the frozen
+        dataclass __init__, which is noticeably cheaper per point when
+        materializing many results at once.
+        
+        Args:
+            xy: Array-like of shape (n, 2) with x and y columns
+            
+        Returns:
+            List of n points, in row order
+        """
+        new = object.__new__
+        set_x = cls.x.__set__
+        set_y = cls.y.__set__
+        points = []
+        for x, y in np.asarray(xy, dtype=np.float64).reshape(-1, 2).tolist():
+            point = new(cls)
+            set_x(point, x)
+            set_y(point, y)
+            points.append(point)
+        return points
+    
+    def __reduce__(self):
+        """Pickle by constructor arguments; frozen slots cannot be restored by setattr."""
+        return (Point, (self.x, self.y))
     
     def __hash__(self):
-        """Make Point hashable for use in sets and dicts."""
-        return hash((round(self.x, 6), round(self.y, 6)))
+        """Make Point hashable for use in sets and dicts (6-decimal integer grid)."""
+        x, y = self.x * _HASH_SCALE, self.y * _HASH_SCALE
+        if not (math.isfinite(x) and math.isfinite(y)):
+            # inf and nan cannot be rounded to an integer grid cell
+            return hash((self.x, self.y))
+        return hash((round(x), round(y)))
     
     def __eq__(self, other):
         """Check equality with tolerance for floating point comparison."""
         if not isinstance(other, Point):
             return False
-        tolerance = 1e-6
-        return (abs(self.x - other.x) < tolerance and 
-                abs(self.y - other.y) < tolerance)
+        return (abs(self.x - other.x) < _EQ_TOLERANCE and 
+                abs(self.y - other.y) < _EQ_TOLERANCE)
 
 
-@dataclass
+@dataclass(frozen=True)
 class Vector2D:
     """
-    A 2D vector representing direction and magnitude.
+    A 2D immutable vector representing direction and magnitude.
     
     Attributes:
         dx: X-component of the vector
         dy: Y-component of the vector
     """
+    __slots__ = ('dx', 'dy')
+    
     dx: float
     dy: float
     
@@ -67,7 +131,7 @@ class Vector2D:
         Returns:
             The Euclidean length of the vector
         """
-        return math.sqrt(self.dx ** 2 + self.dy ** 2)
+        return math.sqrt(self.dx * self.dx + self.dy * self.dy)
     
     def normalize(self) -> 'Vector2D':
         """
@@ -79,10 +143,15 @@ class Vector2D:
         Raises:
             ValueError: If the vector has zero magnitude
         """
-        mag = self.magnitude()
+        dx, dy = self.dx, self.dy
+        mag = math.sqrt(dx * dx + dy * dy)
         if mag == 0:
             raise ValueError("Cannot normalize zero-length vector")
-        return Vector2D(self.dx / mag, self.dy / mag)
+        return _new_vector(dx / mag, dy / mag)
+    
+    def __reduce__(self):
+        """Pickle by constructor arguments; frozen slots cannot be restored by setattr."""
+        return (Vector2D, (self.dx, self.dy))
     
     def scale(self, factor: float) -> 'Vector2D':
         """
@@ -94,15 +163,57 @@ class Vector2D:
         Returns:
             A new vector scaled by the factor
         """
-        return Vector2D(self.dx * factor, self.dy * factor)
+        return _new_vector(self.dx * factor, self.dy * factor)
     
     def __add__(self, other: 'Vector2D') -> 'Vector2D':
         """Add two vectors."""
-        return Vector2D(self.dx + other.dx, self.dy + other.dy)
+        return _new_vector(self.dx + other.dx, self.dy + other.dy)
     
     def __sub__(self, other: 'Vector2D') -> 'Vector2D':
         """Subtract two vectors."""
-        return Vector2D(self.dx - other.dx, self.dy - other.dy)
+        return _new_vector(self.dx - other.dx, self.dy - other.dy)
+
+
+
+_set_dx = Vector2D.dx.__set__
+_set_dy = Vector2D.dy.__set__
+
+
+def _new_vector(dx: float, dy: float) -> Vector2D:
+    """
+    Create a Vector2D by writing its slots directly.
+    
+    Vector arithmetic results skip the frozen dataclass __init__, as
+    Point.from_array does for points; the values are identical.
+    """
+    vec = object.__new__(Vector2D)
+    _set_dx(vec, dx)
+    _set_dy(vec, dy)
+    return vec
+
+class _LazyGeometry:
+    """
+    Data descriptor for LineSegment.shapely_geom.
+    
+    Stores an explicitly supplied geometry as-is, and otherwise builds the
+    Shapely LineString from the segment's coordinate array on first access.
+    Seen from the class, it yields None, which dataclass uses as the field default.
+    """
+    
+    def __set_name__(self, owner, name):
+        self._attr = '_' + name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return None
+        geom = getattr(obj, self._attr)
+        if geom is None:
+            geom = LineString(obj.xy)
+            setattr(obj, self._attr, geom)
+        return geom
+    
+    def __set__(self, obj, value):
+        setattr(obj, self._attr, value)
 
 
 @dataclass
@@ -113,28 +224,89 @@ class LineSegment:
     Attributes:
         id: Unique identifier for the segment
         coordinates: Ordered list of points defining the segment
-        shapely_geom: Shapely LineString representation for geometric operations
+        shapely_geom: Shapely LineString representation for geometric operations,
+                      built lazily from the coordinates on first access when
+                      not supplied
+        xy: Contiguous (n, 2) float64 array of the coordinates, used by the
+            numeric kernels instead of iterating over Point objects
+        bounds: Cached (minx, miny, maxx, maxy) of the Shapely geometry
+    
+    Segments are slotted, so they carry no per-instance dict. The derived
+    attributes (xy, bounds and the memoized length and edge arrays) are
+    plain slots set in __post_init__ rather than dataclass fields, since a
+    slot cannot also hold a class-level field default.
     """
+    __slots__ = ('id', 'coordinates', '_shapely_geom', 'xy', 'bounds',
+                 '_length', '_edge_cache')
+    
     id: int
     coordinates: List[Point]
-    shapely_geom: Optional[LineString] = None
+    shapely_geom: Optional[LineString] = _LazyGeometry()
     
     def __post_init__(self):
-        """Initialize Shapely geometry from coordinates if not provided."""
-        if self.shapely_geom is None:
-            if len(self.coordinates) < 2:
-                raise ValueError(f"LineSegment must have at least 2 points, got {len(self.coordinates)}")
-            coords = [(p.x, p.y) for p in self.coordinates]
-            self.shapely_geom = LineString(coords)
+        """Build the coordinate array and bounds; the geometry is deferred."""
+        self._set_derived(np.array(
+            [(p.x, p.y) for p in self.coordinates], dtype=np.float64
+        ).reshape(-1, 2))
+    
+    @classmethod
+    def from_array(cls, id: int, xy: np.ndarray,
+                   shapely_geom: Optional[LineString] = None) -> 'LineSegment':
+        """
+        Create a segment from an (n, 2) coordinate array.
+        
+        The array is kept as the segment's xy instead of being rebuilt from
+        the points, so callers that already hold the coordinates as an array
+        (the WKT parser) skip a copy per segment.
+        
+        Args:
+            id: Unique identifier for the segment
+            xy: Array-like of shape (n, 2) with x and y columns
+            shapely_geom: Optional prebuilt geometry for the same coordinates
+            
+        Returns:
+            The new LineSegment
+            
+        Raises:
+            ValueError: If fewer than 2 points are given
+        """
+        xy = np.ascontiguousarray(xy, dtype=np.float64).reshape(-1, 2)
+        segment = object.__new__(cls)
+        segment.id = id
+        segment.coordinates = Point.from_array(xy)
+        segment._shapely_geom = shapely_geom
+        segment._set_derived(xy)
+        return segment
+    
+    def _set_derived(self, xy: np.ndarray) -> None:
+        """Store the coordinate array and reset or derive the cached values."""
+        self._length = None
+        self._edge_cache = None
+        self.xy = xy
+        provided = self._shapely_geom
+        if provided is None:
+            if len(xy) < 2:
+                raise ValueError(f"LineSegment must have at least 2 points, got {len(xy)}")
+            lo = xy.min(axis=0)
+            hi = xy.max(axis=0)
+            self.bounds = (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+        else:
+            self.bounds = provided.bounds
     
     def length(self) -> float:
         """
         Calculate the total length of the segment.
         
+        The value is computed on first call and memoized, since segment
+        coordinates are not modified after construction.
+        
         Returns:
             The total length of the line segment
         """
-        return self.shapely_geom.length
+        if self._length is None:
+            edges = np.diff(self.xy, axis=0)
+            self._length = float(np.hypot(edges[:, 0], edges[:, 1]).sum())
+        return self._length
     
     def get_perpendicular_vector(self, at_point: Point) -> Vector2D:
         """
@@ -153,40 +325,57 @@ class LineSegment:
         Raises:
             ValueError: If the point is not on or near the segment
         """
-        # Find the nearest segment between consecutive vertices
-        min_dist = float('inf')
-        best_idx = 0
+        starts, edges, edge_len2, normals = self._edge_geometry()
         
-        for i in range(len(self.coordinates) - 1):
-            p1 = self.coordinates[i]
-            p2 = self.coordinates[i + 1]
-            
-            # Calculate distance from at_point to this segment
-            # Using point-to-line distance formula
-            line_vec = Vector2D(p2.x - p1.x, p2.y - p1.y)
-            point_vec = Vector2D(at_point.x - p1.x, at_point.y - p1.y)
-            
-            line_len = line_vec.magnitude()
-            if line_len == 0:
-                continue
-                
-            # Project point onto line
-            t = max(0, min(1, (point_vec.dx * line_vec.dx + point_vec.dy * line_vec.dy) / (line_len ** 2)))
-            closest = Point(p1.x + t * line_vec.dx, p1.y + t * line_vec.dy)
-            dist = at_point.distance_to(closest)
-            
-            if dist < min_dist:
-                min_dist = dist
-                best_idx = i
+        # Project the point onto every edge at once
+        p = np.array([at_point.x, at_point.y])
+        
+        # Zero-length edges have no direction; never pick them as nearest
+        degenerate = edge_len2 == 0
+        safe_len2 = np.where(degenerate, 1.0, edge_len2)
+        t = np.clip(((p - starts) * edges).sum(axis=1) / safe_len2, 0.0, 1.0)
+        closest = starts + t[:, None] * edges
+        dist2 = ((closest - p) ** 2).sum(axis=1)
+        dist2[degenerate] = np.inf
+        
+        # Look up the precomputed unit normal of the nearest edge
+        best_idx = int(dist2.argmin())
+        if degenerate[best_idx]:
+            raise ValueError("Cannot normalize zero-length vector")
+        nx, ny = normals[best_idx].tolist()
+        return _new_vector(nx, ny)
+    
+    def first_direction(self) -> Vector2D:
+        """
+        Get the direction vector of the first edge (first to second point).
         
-        # Get the direction vector of the best segment
-        p1 = self.coordinates[best_idx]
-        p2 = self.coordinates[best_idx + 1]
-        direction = Vector2D(p2.x - p1.x, p2.y - p1.y)
+        Read from the same memoized edge arrays as get_perpendicular_vector.
         
-        # Perpendicular is (-dy, dx) normalized
-        perpendicular = Vector2D(-direction.dy, direction.dx)
-        return perpendicular.normalize()
+        Returns:
+            The unnormalized vector from coordinates[0] to coordinates[1]
+        """
+        dx, dy = self._edge_geometry()[1][0].tolist()
+        return _new_vector(dx, dy)
+    
+    def _edge_geometry(self) -> tuple:
+        """
+        Get per-edge arrays used by get_perpendicular_vector.
+        
+        Computed on first call and memoized like length(), so repeated
+        perpendicular queries on a segment only redo the point projection.
+        
+        Returns:
+            Tuple of (edge start points, edge vectors, squared edge lengths,
+            unit normals (-dy, dx) / |edge|), each with one row per edge;
+            normals of zero-length edges are NaN
+        """
+        if self._edge_cache is None:
+            edges = np.diff(self.xy, axis=0)
+            edge_len2 = (edges * edges).sum(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                normals = np.column_stack((-edges[:, 1], edges[:, 0])) / np.sqrt(edge_len2)[:, None]
+            self._edge_cache = (self.xy[:-1], edges, edge_len2, normals)
+        return self._edge_cache
     
     def start_point(self) -> Point:
         """Get the first point of the segment."""
@@ -235,6 +424,11 @@ class Conflict:
         actual_distance: The measured distance between the segments
         required_displacement: How much displacement is needed to resolve the conflict
     """
+    __slots__ = (
+        'segment1', 'segment2', 'min_distance_point1', 'min_distance_point2',
+        'actual_distance', 'required_displacement'
+    )
+    
     segment1: LineSegment
     segment2: LineSegment
     min_distance_point1: Point
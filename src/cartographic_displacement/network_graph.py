@@ -8,6 +8,9 @@ and spatial indexing for efficient proximity queries.
 
 from typing import List, Dict, Set, Tuple
 from collections import defaultdict
+import math
+import numpy as np
+import shapely
 from shapely.strtree import STRtree
 
 from .models import LineSegment, IntersectionPoint, Point
@@ -26,7 +29,14 @@ class NetworkGraph:
         _intersections: Cached list of intersection points
         _spatial_index: R-tree spatial index for efficient proximity queries
         _endpoint_map: Spatial hash map for finding shared endpoints
-        _adjacency_map: Map from segment ID to adjacent segment IDs
+        _adj_indptr: CSR row offsets into _adj_indices, one row per segment
+                     position (length len(segments) + 1)
+        _adj_indices: CSR column array of adjacent segment positions, sorted
+                      within each row
+        _segment_by_id: Map from segment ID to segment, reused by all queries
+        _position_by_id: Map from segment ID to its position in segments
+        _segments_arr: Object array of the segments, indexed by the
+                       positions returned from the spatial index
     """
     
     def __init__(self, segments: List[LineSegment]):
@@ -39,13 +49,34 @@ class NetworkGraph:
         self.segments = segments
         self._intersections: List[IntersectionPoint] = []
         self._spatial_index: STRtree = None
-        self._endpoint_map: Dict[Tuple[float, float], List[int]] = defaultdict(list)
-        self._adjacency_map: Dict[int, Set[int]] = defaultdict(set)
+        self._endpoint_map: Dict[Tuple[float, float], Set[int]] = defaultdict(set)
+        self._adj_indptr = np.zeros(len(segments) + 1, dtype=np.int32)
+        self._adj_indices = np.zeros(0, dtype=np.int32)
+        self._segment_by_id: Dict[int, LineSegment] = {}
+        self._position_by_id: Dict[int, int] = {}
+        self._segments_arr = np.empty(0, dtype=object)
         
         # Build the network topology
+        self._rebuild_caches()
         self._build_topology()
         self._build_spatial_index()
     
+    def _rebuild_caches(self):
+        """
+        Rebuild the lookup tables derived from the segment list.
+        
+        Must be called again if self.segments is modified after construction.
+        """
+        # With duplicate IDs the first segment wins, as a linear scan would find
+        self._segment_by_id = {}
+        self._position_by_id = {}
+        for i, seg in enumerate(self.segments):
+            if seg.id not in self._segment_by_id:
+                self._segment_by_id[seg.id] = seg
+                self._position_by_id[seg.id] = i
+        self._segments_arr = np.empty(len(self.segments), dtype=object)
+        self._segments_arr[:] = self.segments
+    
     def _round_coordinate(self, point: Point, precision: int = 6) -> Tuple[float, float]:
         """
         Round a point's coordinates for use as a hash key.
@@ -55,10 +86,14 @@ class NetworkGraph:
             precision: Number of decimal places to round to
             
         Returns:
-            Tuple of rounded (x, y) coordinates
+            Tuple of rounded (x, y) coordinates; coordinates that are not
+            finite once scaled cannot be rounded and are kept unchanged
         """
         factor = 10 ** precision
-        return (round(point.x * factor) / factor, round(point.y * factor) / factor)
+        return tuple(
+            round(value * factor) / factor if math.isfinite(value * factor) else value
+            for value in (point.x, point.y)
+        )
     
     def _build_topology(self):
         """
@@ -69,49 +104,133 @@ class NetworkGraph:
         2. Identifies intersection points where segments share endpoints
         3. Builds adjacency relationships between connected segments
         """
-        # Build endpoint map: maps rounded coordinates to segment IDs
-        # Use a set to track which (segment_id, endpoint_type) pairs we've seen
-        # to avoid counting the same segment twice at the same location
-        for segment in self.segments:
-            start = self._round_coordinate(segment.start_point())
-            end = self._round_coordinate(segment.end_point())
-            
-            # Only add if start and end are different (avoid self-loops)
-            if start != end:
-                self._endpoint_map[start].append(segment.id)
-                self._endpoint_map[end].append(segment.id)
-            else:
-                # Degenerate case: segment start and end round to same point
-                # Only add once to avoid duplicate counting
-                if segment.id not in self._endpoint_map[start]:
-                    self._endpoint_map[start].append(segment.id)
+        # Build endpoint map: maps rounded coordinates to segment IDs.
+        # Endpoints are quantized to a 1e-6 integer grid in one vectorized
+        # pass (np.rint rounds half to even exactly like round(), so keys
+        # match _round_coordinate) and grouped with a sort instead of
+        # per-endpoint dict appends
+        if self.segments:
+            self._group_endpoints()
         
         # Extract intersections: points where 2+ DIFFERENT segments meet
         intersection_dict: Dict[Tuple[float, float], IntersectionPoint] = {}
         
         for coord, segment_ids in self._endpoint_map.items():
-            # Get unique segment IDs (in case a segment appears twice at same location)
-            unique_segment_ids = list(set(segment_ids))
-            
-            if len(unique_segment_ids) >= 2:
+            # Segment IDs are already unique (a segment appearing twice at
+            # the same location is stored once)
+            if len(segment_ids) >= 2:
                 # This is an intersection point (2+ different segments meet)
                 point = Point(coord[0], coord[1])
                 intersection = IntersectionPoint(
                     location=point,
-                    connected_segment_ids=unique_segment_ids
+                    connected_segment_ids=list(segment_ids)
                 )
                 intersection_dict[coord] = intersection
         
         self._intersections = list(intersection_dict.values())
+        self._build_adjacency()
+    
+    def _build_adjacency(self):
+        """
+        Build the CSR adjacency arrays from the intersection points.
+        
+        Segments are adjacent if they share an endpoint, so every ordered
+        pair of distinct segments meeting at an intersection becomes one
+        entry; pairs meeting at several intersections are stored once.
+        """
+        n = len(self.segments)
+        position_by_id = self._position_by_id
+        
+        # Flatten the segment positions of all intersections, one group each
+        members = np.array(
+            [position_by_id[seg_id]
+             for intersection in self._intersections
+             for seg_id in intersection.connected_segment_ids],
+            dtype=np.int64
+        )
+        sizes = np.array(
+            [len(intersection.connected_segment_ids) for intersection in self._intersections],
+            dtype=np.int64
+        )
+        group_starts = np.cumsum(sizes) - sizes
         
-        # Build adjacency map: segments are adjacent if they share an endpoint
-        for intersection in self._intersections:
-            segment_ids = intersection.connected_segment_ids
-            # Each segment at this intersection is adjacent to all others
-            for seg_id in segment_ids:
-                for other_id in segment_ids:
-                    if seg_id != other_id:
-                        self._adjacency_map[seg_id].add(other_id)
+        # Each segment at an intersection is adjacent to all others: pair
+        # every member with every member of its own group
+        member_sizes = np.repeat(sizes, sizes)
+        member_starts = np.repeat(group_starts, sizes)
+        pair_starts = np.cumsum(member_sizes) - member_sizes
+        total = int(member_sizes.sum())
+        row = np.repeat(members, member_sizes)
+        col = members[
+            np.repeat(member_starts - pair_starts, member_sizes) + np.arange(total)
+        ]
+        distinct = row != col
+        
+        # Sorting the packed (row, col) keys orders the entries; dropping
+        # repeats removes pairs that meet at more than one intersection
+        packed = np.sort(row[distinct] * n + col[distinct])
+        first = np.ones(len(packed), dtype=bool)
+        first[1:] = packed[1:] != packed[:-1]
+        packed = packed[first]
+        row, col = np.divmod(packed, max(n, 1))
+        
+        self._adj_indptr = np.concatenate(
+            ([0], np.cumsum(np.bincount(row, minlength=n)))
+        ).astype(np.int32)
+        self._adj_indices = col.astype(np.int32)
+    
+    def _group_endpoints(self):
+        """
+        Populate the endpoint map by grouping quantized segment endpoints.
+        
+        Groups appear in order of first occurrence, and each group's set of
+        segment IDs is filled in segment order. A segment whose start and end
+        round to the same point is therefore stored there only once.
+        """
+        factor = 10 ** 6
+        # Gather first and last vertices from one concatenated vertex array
+        vertices = np.concatenate([seg.xy for seg in self.segments])
+        ends = np.cumsum([len(seg.xy) for seg in self.segments]) - 1
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        endpoints = np.stack([vertices[starts], vertices[ends]], axis=1)
+        scaled = np.rint(endpoints * factor)
+        
+        # Grid values outside int64 would wrap silently on conversion (inf
+        # exceeds the bound and NaN fails the comparison too); key those
+        # networks by rounded coordinate tuples instead
+        if not np.abs(scaled).max() < 2.0 ** 63:
+            for seg in self.segments:
+                for point in (seg.start_point(), seg.end_point()):
+                    self._endpoint_map[self._round_coordinate(point)].add(seg.id)
+            return
+        
+        keys = scaled.astype(np.int64).reshape(-1, 2)
+        owners = np.repeat(np.arange(len(self.segments)), 2)
+        
+        # Pack each (x, y) key into one int64: rank every axis densely, then
+        # combine the ranks. Unlike bit-packing the raw grid values this can
+        # never overflow, and 1-D unique is far cheaper than unique(axis=0)
+        _, x_rank = np.unique(keys[:, 0], return_inverse=True)
+        y_values, y_rank = np.unique(keys[:, 1], return_inverse=True)
+        packed = x_rank.ravel().astype(np.int64) * len(y_values) + y_rank.ravel()
+        
+        # Label each endpoint with its group, numbering groups by first occurrence
+        _, first, inverse = np.unique(packed, return_index=True, return_inverse=True)
+        order = np.argsort(first, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        labels = rank[inverse.ravel()]
+        
+        # Stable sort keeps segment order within each group
+        members = owners[np.argsort(labels, kind='stable')].tolist()
+        splits = np.cumsum(np.bincount(labels, minlength=len(order))).tolist()
+        coords = (keys[first[order]] / factor).tolist()
+        
+        segment_ids = [seg.id for seg in self.segments]
+        start = 0
+        for (x, y), stop in zip(coords, splits):
+            self._endpoint_map[(x, y)] = {segment_ids[i] for i in members[start:stop]}
+            start = stop
     
     def _build_spatial_index(self):
         """
@@ -124,10 +243,93 @@ class NetworkGraph:
             self._spatial_index = STRtree([])
             return
         
-        # Build STRtree from segment geometries
-        geometries = [seg.shapely_geom for seg in self.segments]
+        # Bulk-load the STRtree from an object array, which Shapely consumes
+        # directly instead of converting a Python list element by element
+        geometries = np.array(
+            [seg.shapely_geom for seg in self.segments], dtype=object
+        )
         self._spatial_index = STRtree(geometries)
     
+    def save(self, filepath: str) -> None:
+        """
+        Save the built topology to a NumPy .npz file.
+        
+        The endpoint map and intersections are stored as flat arrays
+        (coordinates plus CSR-style offsets into segment ID arrays), so a
+        later run on the same segments can call load() instead of
+        rebuilding the topology. Segment geometries are not stored.
+        
+        Args:
+            filepath: Path of the .npz file to write (NumPy appends the
+                      .npz extension if it is missing)
+        """
+        endpoint_ids = list(self._endpoint_map.values())
+        intersection_ids = [ip.connected_segment_ids for ip in self._intersections]
+        
+        np.savez(
+            filepath,
+            segment_ids=np.array([seg.id for seg in self.segments], dtype=np.int64),
+            endpoint_coords=np.array(list(self._endpoint_map.keys()), dtype=np.float64).reshape(-1, 2),
+            endpoint_offsets=np.cumsum([0] + [len(ids) for ids in endpoint_ids]),
+            endpoint_members=np.array([i for ids in endpoint_ids for i in ids], dtype=np.int64),
+            intersection_coords=np.array(
+                [(ip.location.x, ip.location.y) for ip in self._intersections], dtype=np.float64
+            ).reshape(-1, 2),
+            intersection_offsets=np.cumsum([0] + [len(ids) for ids in intersection_ids]),
+            intersection_members=np.array([i for ids in intersection_ids for i in ids], dtype=np.int64),
+        )
+    
+    @classmethod
+    def load(cls, filepath: str, segments: List[LineSegment]) -> 'NetworkGraph':
+        """
+        Restore a network graph saved with save() without rebuilding topology.
+        
+        Only the adjacency arrays (derived from the intersections) and the
+        spatial index (bulk-loaded from the segment geometries) are rebuilt.
+        
+        Args:
+            filepath: Path of the .npz file written by save()
+            segments: The same segments, in the same order, as when saved
+            
+        Returns:
+            The restored NetworkGraph
+            
+        Raises:
+            ValueError: If the segments do not match the saved topology
+        """
+        with np.load(filepath) as data:
+            saved_ids = data['segment_ids'].tolist()
+            if saved_ids != [seg.id for seg in segments]:
+                raise ValueError(
+                    f"Segments do not match saved topology in {filepath}: "
+                    f"expected {len(saved_ids)} segments with the saved IDs in order"
+                )
+            
+            graph = cls.__new__(cls)
+            graph.segments = segments
+            graph._spatial_index = None
+            graph._endpoint_map = defaultdict(set)
+            graph._rebuild_caches()
+            
+            members = data['endpoint_members'].tolist()
+            offsets = data['endpoint_offsets'].tolist()
+            for k, (x, y) in enumerate(data['endpoint_coords'].tolist()):
+                graph._endpoint_map[(x, y)] = set(members[offsets[k]:offsets[k + 1]])
+            
+            members = data['intersection_members'].tolist()
+            offsets = data['intersection_offsets'].tolist()
+            graph._intersections = [
+                IntersectionPoint(
+                    location=Point(x, y),
+                    connected_segment_ids=members[offsets[k]:offsets[k + 1]]
+                )
+                for k, (x, y) in enumerate(data['intersection_coords'].tolist())
+            ]
+        
+        graph._build_adjacency()
+        graph._build_spatial_index()
+        return graph
+    
     def get_intersections(self) -> List[IntersectionPoint]:
         """
         Return all intersection points where segments meet.
@@ -150,8 +352,7 @@ class NetworkGraph:
         Returns:
             List of LineSegment objects connected at this intersection
         """
-        # Build a map from segment ID to segment for quick lookup
-        segment_map = {seg.id: seg for seg in self.segments}
+        segment_map = self._segment_by_id
         
         connected = []
         for seg_id in point.connected_segment_ids:
@@ -173,18 +374,14 @@ class NetworkGraph:
         Returns:
             List of LineSegment objects adjacent to the given segment
         """
-        # Get adjacent segment IDs from the adjacency map
-        adjacent_ids = self._adjacency_map.get(segment.id, set())
-        
-        # Build a map from segment ID to segment for quick lookup
-        segment_map = {seg.id: seg for seg in self.segments}
-        
-        adjacent = []
-        for seg_id in adjacent_ids:
-            if seg_id in segment_map:
-                adjacent.append(segment_map[seg_id])
+        position = self._position_by_id.get(segment.id)
+        if position is None:
+            return []
         
-        return adjacent
+        # Neighbours are one contiguous slice of the CSR column array
+        start, stop = self._adj_indptr[position:position + 2].tolist()
+        segments = self.segments
+        return [segments[i] for i in self._adj_indices[start:stop].tolist()]
     
     def query_nearby_segments(self, segment: LineSegment, buffer_distance: float = None) -> List[LineSegment]:
         """
@@ -204,29 +401,22 @@ class NetworkGraph:
         if self._spatial_index is None or len(self.segments) == 0:
             return []
         
-        # Create query geometry
+        # Create query geometry: the segment's cached bounding box, expanded
+        # by the buffer distance. This is exactly the envelope the tree would
+        # test for a buffered segment, without tessellating a buffer polygon
+        minx, miny, maxx, maxy = segment.bounds
         if buffer_distance is not None and buffer_distance > 0:
-            query_geom = segment.shapely_geom.buffer(buffer_distance)
-        else:
-            query_geom = segment.shapely_geom
-        
-        # Query the spatial index - use query method which returns geometries
-        nearby_geoms = list(self._spatial_index.query(query_geom))
-        
-        # Convert geometries back to LineSegments
-        # Build a map from shapely geometry id to segment
-        geom_to_segment = {id(seg.shapely_geom): seg for seg in self.segments}
+            minx -= buffer_distance
+            miny -= buffer_distance
+            maxx += buffer_distance
+            maxy += buffer_distance
+        query_geom = shapely.box(minx, miny, maxx, maxy)
         
-        nearby_segments = []
-        for geom in nearby_geoms:
-            geom_id = id(geom)
-            if geom_id in geom_to_segment:
-                seg = geom_to_segment[geom_id]
-                # Exclude the query segment itself
-                if seg.id != segment.id:
-                    nearby_segments.append(seg)
+        # Query the spatial index; it returns positions into self.segments
+        hits = np.sort(self._spatial_index.query(query_geom))
         
-        return nearby_segments
+        # Exclude the query segment itself
+        return [seg for seg in self._segments_arr[hits].tolist() if seg.id != segment.id]
     
     def get_segment_by_id(self, segment_id: int) -> LineSegment:
         """
@@ -241,7 +431,7 @@ class NetworkGraph:
         Raises:
             ValueError: If no segment with the given ID exists
         """
-        for segment in self.segments:
-            if segment.id == segment_id:
-                return segment
-        raise ValueError(f"No segment found with ID {segment_id}")
+        try:
+            return self._segment_by_id[segment_id]
+        except KeyError:
+            raise ValueError(f"No segment found with ID {segment_id}") from None
@@ -6,15 +6,96 @@ LINESTRING geometries from files and convert them to internal LineSegment
 representations.
 """
 
+import bisect
+import functools
+import itertools
+import math
+import mmap
+import os
 import re
-from typing import List, Optional
+from typing import IO, List, Optional, Tuple, Union
+import numpy as np
+import shapely
 from shapely import wkt
 from shapely.geometry import LineString
 from shapely.errors import ShapelyError
 
+from ._parallel import map_chunks
 from .models import LineSegment, Point
 
 
+# Inputs with at least this many LINESTRINGs are parsed across worker threads
+PARALLEL_MIN_STRINGS = 50_000
+
+# Coordinate lists with at least this many points are converted by NumPy in
+# one pass; shorter ones are cheaper to convert number by number
+VECTORIZED_MIN_POINTS = 8
+
+
+def _from_wkt(wkt_strings: np.ndarray) -> np.ndarray:
+    """
+    Parse an object array of WKT strings, yielding None for invalid ones.
+    
+    Args:
+        wkt_strings: Object array of WKT strings
+        
+    Returns:
+        Object array of geometries, None where a string failed to parse
+    """
+    # Error state is per thread, so it is set here rather than by the caller
+    with np.errstate(invalid='ignore'):
+        return shapely.from_wkt(wkt_strings, on_invalid='ignore')
+
+
+def _read_coordinates(body: str) -> Optional[Union[List[Point], np.ndarray]]:
+    """
+    Convert a well-formed "x y, x y, ..." coordinate list.
+    
+    Short lists, the common case, are converted with float() directly.
+    Longer ones go through NumPy's text reader, which converts every number
+    in one C-level pass into an (n, 2) array sized from the text, and
+    rounds exactly like float(), but has a fixed cost that only pays off
+    past a few points.
+    
+    Args:
+        body: Coordinate list already validated by SIMPLE_LINESTRING_PATTERN
+        
+    Returns:
+        List of points for short lists, (n, 2) float64 array for long ones,
+        or None if any coordinate is not finite
+    """
+    if body.count(',') < VECTORIZED_MIN_POINTS - 1:
+        points = _read_short_coordinates(body)
+        return None if points is None else list(points)
+    
+    xy = np.fromstring(body.replace(',', ' '), dtype=np.float64, sep=' ').reshape(-1, 2)
+    if not np.isfinite(xy).all():
+        return None
+    return xy
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_short_coordinates(body: str) -> Optional[Tuple[Point, ...]]:
+    """
+    Convert a short coordinate list to points, memoized by its text.
+    
+    Points are immutable, so repeated inputs share them; callers get a
+    fresh list each time. Only lists below VECTORIZED_MIN_POINTS are cached,
+    which bounds the memory held by the cache. The keyword is not part of
+    the key, so differently-cased LINESTRINGs share entries.
+    
+    Args:
+        body: Coordinate list already validated by SIMPLE_LINESTRING_PATTERN
+        
+    Returns:
+        Tuple of points, or None if any coordinate is not finite
+    """
+    values = [float(v) for v in body.replace(',', ' ').split()]
+    if not all(map(math.isfinite, values)):
+        return None
+    return tuple(Point(x, y) for x, y in zip(values[0::2], values[1::2]))
+
+
 class WKTParseError(Exception):
     """Exception raised when WKT parsing fails."""
     
@@ -52,17 +133,41 @@ class WKTParser:
     """
     
     # Regex pattern to extract LINESTRING geometries
-    # Matches LINESTRING(...) including multi-line coordinate lists
+    # Matches LINESTRING(...) including multi-line coordinate lists. The body
+    # is a single negated class, so there is exactly one way to match it and
+    # failed attempts cannot backtrack over how whitespace is split
     LINESTRING_PATTERN = re.compile(
-        r'LINESTRING\s*\(\s*([^)]+)\s*\)',
-        re.IGNORECASE | re.MULTILINE | re.DOTALL
+        r'LINESTRING\s*\(([^)]+)\)',
+        re.IGNORECASE
+    )
+    
+    # Byte-level equivalents, scanned directly over the memory-mapped file
+    LINESTRING_BYTES_PATTERN = re.compile(
+        LINESTRING_PATTERN.pattern.encode('ascii'),
+        re.IGNORECASE
+    )
+    
+    # Line breaks, used to map match offsets back to line numbers
+    NEWLINE_PATTERN = re.compile(rb'\n')
+    
+    # A plain 2D LINESTRING of at least two decimal coordinate pairs. These
+    # are read without Shapely; anything else (including every malformed
+    # string) takes the Shapely path, which produces the detailed errors.
+    # ASCII mode keeps \d and \s to what GEOS accepts: float() would also
+    # read Unicode digits, which GEOS rejects
+    NUMBER_PATTERN = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?', re.ASCII)
+    SIMPLE_LINESTRING_PATTERN = re.compile(
+        r'LINESTRING\s*\(\s*({0}\s+{0}(?:\s*,\s*{0}\s+{0})+)\s*\)'.format(
+            NUMBER_PATTERN.pattern
+        ),
+        re.IGNORECASE | re.ASCII
     )
     
     def __init__(self):
         """Initialize the WKT parser."""
-        self._segment_id_counter = 0
+        self._segment_ids = itertools.count()
     
-    def parse_file(self, filepath: str) -> List[LineSegment]:
+    def parse_file(self, filepath: Union[str, os.PathLike, IO]) -> List[LineSegment]:
         """
         Parse WKT file and return list of line segments.
         
@@ -71,7 +176,8 @@ class WKTParser:
         multiple LINESTRING entries, and coordinates can span multiple lines.
         
         Args:
-            filepath: Path to the WKT file
+            filepath: Path to the WKT file, or an open text or binary file
+                      object (such as io.StringIO) to read the WKT from
             
         Returns:
             List of LineSegment objects parsed from the file
@@ -82,8 +188,7 @@ class WKTParser:
             WKTParseError: If WKT parsing fails
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
+            match_starts, wkt_strings, line_starts = self._scan_file(filepath)
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"WKT file not found: {filepath}\n"
@@ -95,24 +200,29 @@ class WKTParser:
                 f"Error: {str(e)}"
             )
         
-        # Find all LINESTRING geometries in the file
-        matches = self.LINESTRING_PATTERN.finditer(content)
-        
+        # Parse every match in one vectorized call; strings that fail any
+        # check are re-parsed individually below to produce the exact error
+        geoms, valid = self._bulk_parse(wkt_strings)
         segments = []
-        line_numbers = {}  # Track line numbers for error reporting
         
-        # Build a map of character positions to line numbers
-        lines = content.split('\n')
-        char_pos = 0
-        for line_num, line in enumerate(lines, start=1):
-            for i in range(len(line) + 1):  # +1 for newline
-                line_numbers[char_pos] = line_num
-                char_pos += 1
+        # Extract all coordinates in one call; offsets delimit each geometry
+        coords = shapely.get_coordinates(geoms[valid])
+        counts = shapely.get_num_coordinates(geoms[valid])
+        offsets = np.concatenate(([0], np.cumsum(counts))).tolist()
         
-        for match in matches:
-            wkt_string = match.group(0)
-            line_num = line_numbers.get(match.start(), None)
+        k = 0
+        for match_start, wkt_string, geom, is_valid in zip(
+            match_starts, wkt_strings, geoms.tolist(), valid.tolist()
+        ):
+            if is_valid:
+                segment = LineSegment.from_array(
+                    self._get_next_id(), coords[offsets[k]:offsets[k + 1]], shapely_geom=geom
+                )
+                segments.append(segment)
+                k += 1
+                continue
             
+            line_num = bisect.bisect_right(line_starts, match_start)
             try:
                 segment = self.parse_linestring(wkt_string)
                 segments.append(segment)
@@ -128,13 +238,76 @@ class WKTParser:
         
         return segments
     
+    def _scan_file(self, filepath: Union[str, os.PathLike, IO]) -> Tuple[List[int], List[str], List[int]]:
+        """
+        Locate every LINESTRING in a file without reading it into memory.
+        
+        The file is memory-mapped and scanned with byte patterns, so only
+        the matched WKT text is copied out; the OS pages the rest in and out
+        as the scan advances. Offsets are byte offsets, which is consistent
+        for line numbering since a newline is always a single byte in UTF-8.
+        File objects are read once and their contents scanned the same way.
+        
+        Args:
+            filepath: Path to the WKT file, or an open file object
+            
+        Returns:
+            Tuple of (byte offset of each match, decoded WKT string of each
+            match, byte offsets at which each line starts)
+        """
+        if hasattr(filepath, 'read'):
+            data = filepath.read()
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            return self._scan_buffer(data)
+        
+        with open(filepath, 'rb') as f:
+            # An empty file cannot be mapped, and contains nothing to scan
+            if os.fstat(f.fileno()).st_size == 0:
+                return [], [], [0]
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self._scan_buffer(mm)
+    
+    def _scan_buffer(self, buffer) -> Tuple[List[int], List[str], List[int]]:
+        """
+        Locate every LINESTRING in a bytes-like buffer.
+        
+        Args:
+            buffer: UTF-8 encoded WKT text, as bytes or a memory map
+            
+        Returns:
+            Tuple as returned by _scan_file
+        """
+        # Copy every match out before returning; match objects keep the
+        # buffer exported while they are alive, which would stop a memory
+        # map from closing, so they only live inside these comprehensions
+        hits = [
+            (m.start(), m.group(0))
+            for m in self.LINESTRING_BYTES_PATTERN.finditer(buffer)
+        ]
+        
+        # A match's line number is found by bisecting its start offset
+        line_starts = [0]
+        line_starts.extend(
+            [m.end() for m in self.NEWLINE_PATTERN.finditer(buffer)]
+        )
+        
+        # Matches spanning lines keep CRLF line endings; normalize them to
+        # '\n' as text-mode reading would, so no '\r' reaches error messages
+        match_starts = [start for start, _ in hits]
+        wkt_strings = [text.replace(b'\r\n', b'\n').decode('utf-8') for _, text in hits]
+        return match_starts, wkt_strings, line_starts
+    
     def parse_linestring(self, wkt_string: str) -> LineSegment:
         """
         Parse single WKT LINESTRING to LineSegment object.
         
         This method converts a WKT LINESTRING string to an internal
-        LineSegment representation. It uses Shapely for the actual WKT
-        parsing and then converts to our internal format.
+        LineSegment representation. Plain 2D coordinate lists are tokenized
+        directly, leaving the Shapely geometry to be built on first use;
+        other input is parsed by Shapely, which also reports what is wrong
+        with malformed strings.
         
         Args:
             wkt_string: WKT LINESTRING string (e.g., "LINESTRING (0 0, 1 1, 2 0)")
@@ -148,10 +321,11 @@ class WKTParser:
         # Clean up the string
         wkt_string = wkt_string.strip()
         
-        # Validate basic format
-        if not wkt_string.upper().startswith('LINESTRING'):
+        # Validate basic format; only the keyword is upper-cased, not the
+        # whole (possibly very long) string
+        if wkt_string[:10].upper() != 'LINESTRING':
             raise WKTParseError(
-                f"Expected 'LINESTRING' but found '{wkt_string.split()[0] if wkt_string else 'empty string'}'",
+                f"Expected 'LINESTRING' but found '{wkt_string.split(None, 1)[0] if wkt_string else 'empty string'}'",
                 wkt_string=wkt_string
             )
         
@@ -162,6 +336,16 @@ class WKTParser:
                 wkt_string=wkt_string
             )
         
+        match = self.SIMPLE_LINESTRING_PATTERN.fullmatch(wkt_string)
+        if match is not None:
+            coordinates = _read_coordinates(match.group(1))
+            # Overflowing literals parse as infinity; those are left to the
+            # Shapely path so they are rejected with the usual message
+            if isinstance(coordinates, np.ndarray):
+                return LineSegment.from_array(self._get_next_id(), coordinates)
+            if coordinates is not None:
+                return LineSegment(id=self._get_next_id(), coordinates=coordinates)
+        
         try:
             # Use Shapely to parse the WKT
             geom = wkt.loads(wkt_string)
@@ -187,7 +371,6 @@ class WKTParser:
                 )
             
             # Validate coordinates for NaN and infinity
-            import math
             for i, (x, y) in enumerate(geom.coords):
                 if math.isnan(x) or math.isnan(y):
                     raise WKTParseError(
@@ -235,6 +418,50 @@ class WKTParser:
                 wkt_string=wkt_string
             )
     
+    def _bulk_parse(self, wkt_strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parse many WKT strings at once and flag those passing all checks.
+        
+        A string is flagged valid only if it has balanced parentheses and
+        parses to a 2D LineString with at least 2 finite coordinates, i.e.
+        exactly when parse_linestring would accept it.
+        
+        Args:
+            wkt_strings: WKT LINESTRING strings
+            
+        Returns:
+            Tuple of (object array of geometries or None, boolean validity mask)
+        """
+        geoms = self._parse_strings(np.array(wkt_strings, dtype=object))
+        
+        valid = shapely.get_type_id(geoms) == shapely.GeometryType.LINESTRING
+        valid &= shapely.get_num_coordinates(geoms) >= 2
+        valid &= ~shapely.has_z(geoms)
+        valid &= np.fromiter(
+            (w.count('(') == w.count(')') for w in wkt_strings),
+            dtype=bool,
+            count=len(wkt_strings)
+        )
+        
+        # Reject geometries with NaN or infinite coordinates
+        coords, index = shapely.get_coordinates(geoms[valid], return_index=True)
+        bad_rows = index[~np.isfinite(coords).all(axis=1)]
+        valid[np.flatnonzero(valid)[bad_rows]] = False
+        
+        return geoms, valid
+    
+    def _parse_strings(self, wkt_strings: np.ndarray) -> np.ndarray:
+        """
+        Convert WKT strings to geometries, in parallel for large inputs.
+        
+        Args:
+            wkt_strings: Object array of WKT strings
+            
+        Returns:
+            Object array of geometries, None where a string failed to parse
+        """
+        return map_chunks(_from_wkt, (wkt_strings,), PARALLEL_MIN_STRINGS)
+    
     def _get_next_id(self) -> int:
         """
         Get the next segment ID.
@@ -242,10 +469,10 @@ class WKTParser:
         Returns:
             Next available segment ID
         """
-        segment_id = self._segment_id_counter
-        self._segment_id_counter += 1
-        return segment_id
+        # next() on a count is a single C call, and never hands out the
+        # same ID twice even if segments are created from several threads
+        return next(self._segment_ids)
     
     def reset_id_counter(self):
         """Reset the segment ID counter to 0."""
-        self._segment_id_counter = 0
+        self._segment_ids = itertools.count()
@@ -7,7 +7,9 @@ formatting.
 """
 
 import os
-from typing import List, Union
+from typing import Iterator, List, Union
+import numpy as np
+import shapely
 from shapely.geometry import LineString
 
 from .models import LineSegment
@@ -32,9 +34,20 @@ class WKTPrettyPrinter:
         Raises:
             ValueError: If precision is negative
         """
+        self.precision = precision
+    
+    @property
+    def precision(self) -> int:
+        """Number of decimal places used for coordinate formatting."""
+        return self._precision
+    
+    @precision.setter
+    def precision(self, precision: int) -> None:
         if precision < 0:
             raise ValueError(f"Precision cannot be negative, got {precision}")
-        self.precision = precision
+        self._precision = precision
+        # Bound format method for one "x y" pair, built once per precision
+        self._pair_format = f"{{:.{precision}f}} {{:.{precision}f}}".format
     
     def format_segment(self, segment: LineSegment) -> str:
         """
@@ -52,7 +65,40 @@ class WKTPrettyPrinter:
         Raises:
             ValueError: If segment has invalid geometry
         """
-        if segment.shapely_geom is None or segment.shapely_geom.is_empty:
+        self._validate_segment(segment)
+        return self._format_segment_fast(segment)
+    
+    def _format_segment_fast(self, segment: LineSegment) -> str:
+        """
+        Format a segment that is already known to be valid.
+        
+        Args:
+            segment: A validated LineSegment
+            
+        Returns:
+            WKT LINESTRING string representation
+        """
+        # Format coordinates with specified precision, read from the segment's
+        # coordinate array so a lazily built geometry is never created
+        pair_format = self._pair_format
+        coords_str = ", ".join([pair_format(x, y) for x, y in segment.xy.tolist()])
+        
+        return f"LINESTRING ({coords_str})"
+    
+    def _validate_segment(self, segment: LineSegment) -> None:
+        """
+        Check that a segment can be formatted.
+        
+        Args:
+            segment: The LineSegment to check
+            
+        Raises:
+            ValueError: If segment has invalid geometry
+        """
+        # Only a supplied geometry is inspected; reading shapely_geom would
+        # build the lazy one just to find it matches the coordinates
+        geom = segment._shapely_geom
+        if len(segment.xy) == 0 or (geom is not None and geom.is_empty):
             raise ValueError(f"Cannot format empty or invalid segment (ID: {segment.id})")
         
         if len(segment.coordinates) < 2:
@@ -60,14 +106,64 @@ class WKTPrettyPrinter:
                 f"Segment must have at least 2 points, got {len(segment.coordinates)} "
                 f"(ID: {segment.id})"
             )
+    
+    def _validate_network(self, segments: List[LineSegment]) -> None:
+        """
+        Check that every segment of a network can be formatted.
+        
+        Args:
+            segments: List of LineSegment objects to check
+            
+        Raises:
+            ValueError: If segments list is empty or contains invalid segments
+        """
+        if not segments:
+            raise ValueError("Cannot format empty network (no segments provided)")
         
-        # Format coordinates with specified precision
-        coords_str = ", ".join(
-            f"{coord[0]:.{self.precision}f} {coord[1]:.{self.precision}f}"
-            for coord in segment.shapely_geom.coords
+        # Check the whole batch at once; only a failing segment goes through
+        # the per-segment check, which produces the detailed message. Unbuilt
+        # lazy geometries are None here, which shapely.is_empty reports as False
+        geoms = [segment._shapely_geom for segment in segments]
+        invalid = (
+            shapely.is_empty(geoms)
+            | (np.array([len(segment.coordinates) for segment in segments]) < 2)
         )
+        for index in np.flatnonzero(invalid)[:1].tolist():
+            segment = segments[index]
+            try:
+                self._validate_segment(segment)
+            except ValueError as e:
+                raise ValueError(f"Error formatting segment {segment.id}: {str(e)}")
+    
+    def iter_wkt_lines(self, segments: List[LineSegment],
+                       validated: bool = False) -> Iterator[str]:
+        """
+        Yield the WKT LINESTRING line of each segment, in order.
         
-        return f"LINESTRING ({coords_str})"
+        Lines are produced one at a time, so a whole network can be written
+        without holding its full WKT text in memory.
+        
+        Args:
+            segments: List of LineSegment objects to format
+            validated: True if the segments were already checked with
+                       _validate_network, which skips the per-segment checks
+            
+        Yields:
+            WKT LINESTRING string for each segment (without newline)
+            
+        Raises:
+            ValueError: If a segment is invalid (raised when it is reached)
+        """
+        if validated:
+            yield from map(self._format_segment_fast, segments)
+            return
+        
+        for segment in segments:
+            try:
+                yield self.format_segment(segment)
+            except ValueError as e:
+                # Re-raise with more context
+                raise ValueError(f"Error formatting segment {segment.id}: {str(e)}")
     
     def format_network(self, segments: List[LineSegment]) -> str:
         """
@@ -85,20 +181,9 @@ class WKTPrettyPrinter:
         Raises:
             ValueError: If segments list is empty or contains invalid segments
         """
-        if not segments:
-            raise ValueError("Cannot format empty network (no segments provided)")
-        
-        # Format each segment and join with newlines
-        wkt_lines = []
-        for segment in segments:
-            try:
-                wkt_line = self.format_segment(segment)
-                wkt_lines.append(wkt_line)
-            except ValueError as e:
-                # Re-raise with more context
-                raise ValueError(f"Error formatting segment {segment.id}: {str(e)}")
-        
-        return "\n".join(wkt_lines)
+        # Validate once up front, then format each segment and join with newlines
+        self._validate_network(segments)
+        return "\n".join([self._format_segment_fast(segment) for segment in segments])
     
     def write_file(self, segments: Union[List[LineSegment], LineSegment], 
                    filepath: str) -> None:
@@ -107,7 +192,9 @@ class WKTPrettyPrinter:
         
         This method writes LineSegment objects to a file in WKT format.
         The file is written atomically using a temporary file to prevent
-        corruption of existing files in case of errors.
+        corruption of existing files in case of errors. All segments are
+        validated up front, then formatted lines are streamed to the file
+        so the full WKT text is never held in memory.
         
         Args:
             segments: LineSegment or list of LineSegment objects to write
@@ -122,16 +209,12 @@ class WKTPrettyPrinter:
         if isinstance(segments, LineSegment):
             segments = [segments]
         
-        # Format the network
+        # Validate the network before touching the filesystem
         try:
-            wkt_content = self.format_network(segments)
+            self._validate_network(segments)
         except ValueError as e:
             raise ValueError(f"Cannot write invalid geometry to file: {str(e)}")
         
-        # Ensure the content ends with a newline
-        if not wkt_content.endswith('\n'):
-            wkt_content += '\n'
-        
         # Write to temporary file first for atomic operation
         temp_filepath = filepath + '.tmp'
         
@@ -150,7 +233,9 @@ class WKTPrettyPrinter:
             # Write to temporary file
             try:
                 with open(temp_filepath, 'w', encoding='utf-8') as f:
-                    f.write(wkt_content)
+                    f.writelines(
+                        line + '\n' for line in self.iter_wkt_lines(segments, validated=True)
+                    )
             except PermissionError:
                 raise PermissionError(
                     f"Permission denied: Cannot write to {filepath}\n"
@@ -7,7 +7,7 @@ and DisplacementConfig classes.
 
 import pytest
 import math
-from shapely.geometry import LineString
+import numpy as np
 
 from src.cartographic_displacement.models import (
     Point,
@@ -39,6 +39,13 @@ class TestPoint:
         p = Point(1.0, 2.0)
         assert p.distance_to(p) == 0.0
     
+    def test_distance_to_squared(self):
+        """Test squared distance calculation matches distance_to."""
+        p1 = Point(0.0, 0.0)
+        p2 = Point(3.0, 4.0)
+        assert p1.distance_to_squared(p2) == 25.0
+        assert abs(math.sqrt(p1.distance_to_squared(p2)) - p1.distance_to(p2)) < 1e-12
+    
     def test_point_equality(self):
         """Test point equality with tolerance."""
         p1 = Point(1.0, 2.0)
@@ -58,6 +65,44 @@ class TestPoint:
         
         point_set = {p1, p2, p3}
         assert len(point_set) == 2  # p1 and p2 should be the same
+    
+    def test_point_is_immutable_and_slotted(self):
+        """Test that points cannot be mutated and carry no instance dict."""
+        p = Point(1.0, 2.0)
+        with pytest.raises(AttributeError):
+            p.x = 5.0
+        assert not hasattr(p, '__dict__')
+    
+    def test_point_pickle_and_copy(self):
+        """Test that frozen slotted points survive pickling and deep copies."""
+        import copy
+        import pickle
+        p = Point(1.5, -2.5)
+        assert pickle.loads(pickle.dumps(p)) == p
+        assert copy.deepcopy(p) == p
+        v = Vector2D(3.0, 4.0)
+        assert pickle.loads(pickle.dumps(v)) == v
+    
+    def test_point_from_array(self):
+        """Test bulk point creation from a coordinate array."""
+        points = Point.from_array([[0.0, 1.0], [2.5, -3.0]])
+        assert points == [Point(0.0, 1.0), Point(2.5, -3.0)]
+        assert all(type(p) is Point for p in points)
+        assert Point.from_array([]) == []
+    
+    def test_point_hash_uses_six_decimal_grid(self):
+        """Test that points differing below the 6th decimal hash identically."""
+        assert hash(Point(1.0, -2.0)) == hash(Point(1.0000001, -2.0000001))
+        assert hash(Point(0.1234564, 0.0)) != hash(Point(0.1234566, 0.0))
+    
+    def test_point_hash_non_finite(self):
+        """Test that points with inf or nan coordinates are still hashable."""
+        assert hash(Point(math.inf, 0.0)) == hash(Point(math.inf, 0.0))
+        assert hash(Point(0.0, -math.inf)) != hash(Point(0.0, math.inf))
+        point = Point(math.nan, 1.0)
+        assert {point: 1}[point] == 1
+        # Finite values that overflow once scaled fall back too
+        assert hash(Point(1e308, 0.0)) == hash(Point(1e308, 0.0))
 
 
 class TestVector2D:
@@ -83,9 +128,9 @@ class TestVector2D:
         """Test vector normalization."""
         v = Vector2D(3.0, 4.0)
         normalized = v.normalize()
-        assert abs(normalized.magnitude() - 1.0) < 1e-10
-        assert abs(normalized.dx - 0.6) < 1e-10
-        assert abs(normalized.dy - 0.8) < 1e-10
+        assert normalized.magnitude() == pytest.approx(1.0, abs=1e-10)
+        assert normalized.dx == pytest.approx(0.6, abs=1e-10)
+        assert normalized.dy == pytest.approx(0.8, abs=1e-10)
     
     def test_normalize_zero_vector_raises_error(self):
         """Test that normalizing zero vector raises ValueError."""
@@ -130,6 +175,7 @@ class TestLineSegment:
     
     def test_line_segment_with_shapely_geom(self):
         """Test line segment creation with provided Shapely geometry."""
+        from shapely.geometry import LineString
         points = [Point(0.0, 0.0), Point(1.0, 1.0)]
         shapely_line = LineString([(0.0, 0.0), (1.0, 1.0)])
         segment = LineSegment(id=1, coordinates=points, shapely_geom=shapely_line)
@@ -167,39 +213,123 @@ class TestLineSegment:
         end = segment.end_point()
         assert end == Point(3.0, 4.0)
     
-    def test_get_perpendicular_vector_horizontal_line(self):
-        """Test perpendicular vector for horizontal line."""
-        points = [Point(0.0, 0.0), Point(10.0, 0.0)]
+    def test_get_perpendicular_vector_straight_lines(self):
+        """Test perpendicular vectors for horizontal, vertical and diagonal lines."""
+        lines = np.array([
+            [[0.0, 0.0], [10.0, 0.0]],
+            [[0.0, 0.0], [0.0, 10.0]],
+            [[0.0, 0.0], [3.0, 4.0]],
+        ])
+        
+        # The perpendicular is the unit direction rotated a quarter turn left
+        dirs = lines[:, 1] - lines[:, 0]
+        dirs /= np.linalg.norm(dirs, axis=1, keepdims=True)
+        expected = np.stack([-dirs[:, 1], dirs[:, 0]], axis=1)
+        
+        got = []
+        for (x0, y0), (x1, y1) in lines.tolist():
+            segment = LineSegment(id=1, coordinates=[Point(x0, y0), Point(x1, y1)])
+            perp = segment.get_perpendicular_vector(Point((x0 + x1) / 2, (y0 + y1) / 2))
+            got.append((perp.dx, perp.dy))
+        
+        np.testing.assert_allclose(got, expected, rtol=0, atol=1e-10)
+
+    def test_xy_array_matches_coordinates(self):
+        """Test that the coordinate array mirrors the point list."""
+        points = [Point(0.0, 0.0), Point(3.0, 0.0), Point(3.0, 4.0)]
+        segment = LineSegment(id=1, coordinates=points)
+        assert segment.xy.shape == (3, 2)
+        assert segment.xy.tolist() == [[0.0, 0.0], [3.0, 0.0], [3.0, 4.0]]
+    
+    def test_bounds_cached_from_geometry(self):
+        """Test that bounds are computed once and match the Shapely geometry."""
+        points = [Point(0.0, 5.0), Point(3.0, -1.0), Point(-2.0, 4.0)]
         segment = LineSegment(id=1, coordinates=points)
-        perp = segment.get_perpendicular_vector(Point(5.0, 0.0))
+        assert segment.bounds == (-2.0, -1.0, 3.0, 5.0)
+        assert segment.bounds == segment.shapely_geom.bounds
+    
+    def test_shapely_geom_built_lazily(self):
+        """Test that the geometry is built on first access and then reused."""
+        points = [Point(0.0, 0.0), Point(3.0, 4.0)]
+        segment = LineSegment(id=1, coordinates=points)
+        assert segment.bounds == (0.0, 0.0, 3.0, 4.0)
+        assert segment._shapely_geom is None
         
-        # Perpendicular to horizontal should be vertical
-        assert abs(perp.dx) < 1e-10
-        assert abs(abs(perp.dy) - 1.0) < 1e-10
+        geom = segment.shapely_geom
+        assert list(geom.coords) == [(0.0, 0.0), (3.0, 4.0)]
+        assert segment.shapely_geom is geom
     
-    def test_get_perpendicular_vector_vertical_line(self):
-        """Test perpendicular vector for vertical line."""
-        points = [Point(0.0, 0.0), Point(0.0, 10.0)]
+    def test_arithmetic_does_not_build_geometry(self):
+        """Test that length and vector queries run without a Shapely geometry."""
+        points = [Point(0.0, 0.0), Point(3.0, 0.0), Point(3.0, 4.0)]
         segment = LineSegment(id=1, coordinates=points)
-        perp = segment.get_perpendicular_vector(Point(0.0, 5.0))
         
-        # Perpendicular to vertical should be horizontal
-        assert abs(abs(perp.dx) - 1.0) < 1e-10
-        assert abs(perp.dy) < 1e-10
+        segment.length()
+        segment.start_point()
+        segment.end_point()
+        segment.first_direction()
+        segment.get_perpendicular_vector(Point(3.0, 2.0))
+        
+        assert segment._shapely_geom is None
+        
+    def test_line_segment_from_array(self):
+        """Test that building from an array matches building from points."""
+        xy = np.array([[0.0, 5.0], [3.0, -1.0], [-2.0, 4.0]])
+        segment = LineSegment.from_array(3, xy)
+        expected = LineSegment(id=3, coordinates=Point.from_array(xy))
+        
+        assert segment == expected
+        assert segment.xy.tolist() == expected.xy.tolist()
+        assert segment.bounds == expected.bounds
+        assert segment.length() == expected.length()
+        
+        with pytest.raises(ValueError, match="must have at least 2 points"):
+            LineSegment.from_array(1, [[0.0, 0.0]])
     
-    def test_get_perpendicular_vector_diagonal_line(self):
-        """Test perpendicular vector for diagonal line."""
-        points = [Point(0.0, 0.0), Point(3.0, 4.0)]
+    def test_line_segment_is_slotted(self):
+        """Test that segments carry no per-instance dict and survive pickling."""
+        import pickle
+        segment = LineSegment(id=7, coordinates=[Point(0.0, 0.0), Point(3.0, 4.0)])
+        assert not hasattr(segment, '__dict__')
+        
+        restored = pickle.loads(pickle.dumps(segment))
+        assert restored == segment
+        assert restored.bounds == (0.0, 0.0, 3.0, 4.0)
+        assert restored.length() == 5.0
+    
+    def test_get_perpendicular_vector_uses_nearest_edge(self):
+        """Test perpendicular vector on a multi-edge segment picks the nearest edge."""
+        points = [Point(0.0, 0.0), Point(10.0, 0.0), Point(10.0, 10.0)]
+        segment = LineSegment(id=1, coordinates=points)
+        
+        # Near the vertical second edge, the perpendicular should be horizontal
+        perp = segment.get_perpendicular_vector(Point(10.0, 7.0))
+        assert abs(perp.dx) == pytest.approx(1.0, abs=1e-10)
+        assert perp.dy == pytest.approx(0.0, abs=1e-10)
+    
+    def test_get_perpendicular_vector_reuses_edge_geometry(self):
+        """Test that edge normals are computed once and serve every query."""
+        points = [Point(0.0, 0.0), Point(0.0, 0.0), Point(4.0, 3.0)]
         segment = LineSegment(id=1, coordinates=points)
-        perp = segment.get_perpendicular_vector(Point(1.5, 2.0))
         
-        # Perpendicular should be unit vector
-        assert abs(perp.magnitude() - 1.0) < 1e-10
+        first = segment.get_perpendicular_vector(Point(2.0, 1.5))
+        cache = segment._edge_cache
+        second = segment.get_perpendicular_vector(Point(2.0, 1.5))
         
-        # Perpendicular to (3,4) direction should be (-4,3) normalized
-        expected_perp = Vector2D(-4.0, 3.0).normalize()
-        assert abs(perp.dx - expected_perp.dx) < 1e-10
-        assert abs(perp.dy - expected_perp.dy) < 1e-10
+        assert segment._edge_cache is cache
+        assert first == second == Vector2D(-0.6, 0.8)
+    
+    def test_first_direction(self):
+        """Test that the first edge direction runs from the first to the second point."""
+        points = [Point(1.0, 2.0), Point(4.0, 6.0), Point(0.0, 0.0)]
+        segment = LineSegment(id=1, coordinates=points)
+        assert segment.first_direction() == Vector2D(3.0, 4.0)
+    
+    def test_get_perpendicular_vector_all_degenerate_edges_raises_error(self):
+        """Test that a segment without any non-zero edge has no perpendicular."""
+        segment = LineSegment(id=1, coordinates=[Point(1.0, 1.0), Point(1.0, 1.0)])
+        with pytest.raises(ValueError, match="Cannot normalize zero-length vector"):
+            segment.get_perpendicular_vector(Point(1.0, 1.0))
 
 
 class TestIntersectionPoint:
@@ -314,56 +444,39 @@ class TestDisplacementConfig:
         assert config.energy_alpha == 0.5
         assert config.energy_beta == 0.5
     
-    def test_config_negative_min_distance_raises_error(self):
-        """Test that negative min_distance raises ValueError."""
-        with pytest.raises(ValueError, match="min_distance must be positive"):
-            DisplacementConfig(min_distance=-10.0)
-    
-    def test_config_zero_min_distance_raises_error(self):
-        """Test that zero min_distance raises ValueError."""
-        with pytest.raises(ValueError, match="min_distance must be positive"):
-            DisplacementConfig(min_distance=0.0)
-    
-    def test_config_negative_max_displacement_raises_error(self):
-        """Test that negative max_displacement raises ValueError."""
-        with pytest.raises(ValueError, match="max_displacement must be positive"):
-            DisplacementConfig(max_displacement=-50.0)
-    
-    def test_config_invalid_strategy_raises_error(self):
-        """Test that invalid strategy raises ValueError."""
-        with pytest.raises(ValueError, match="strategy must be"):
-            DisplacementConfig(strategy="invalid")
-    
-    def test_config_energy_alpha_out_of_range_raises_error(self):
-        """Test that energy_alpha outside [0,1] raises ValueError."""
-        with pytest.raises(ValueError, match="energy_alpha must be between 0 and 1"):
-            DisplacementConfig(energy_alpha=1.5)
-        
-        with pytest.raises(ValueError, match="energy_alpha must be between 0 and 1"):
-            DisplacementConfig(energy_alpha=-0.1)
-    
-    def test_config_energy_beta_out_of_range_raises_error(self):
-        """Test that energy_beta outside [0,1] raises ValueError."""
-        with pytest.raises(ValueError, match="energy_beta must be between 0 and 1"):
-            DisplacementConfig(energy_beta=1.5)
-        
-        with pytest.raises(ValueError, match="energy_beta must be between 0 and 1"):
-            DisplacementConfig(energy_beta=-0.1)
-    
-    def test_config_negative_max_iterations_raises_error(self):
-        """Test that negative max_iterations raises ValueError."""
-        with pytest.raises(ValueError, match="max_iterations must be positive"):
-            DisplacementConfig(max_iterations=-10)
-    
-    def test_config_negative_convergence_threshold_raises_error(self):
-        """Test that negative convergence_threshold raises ValueError."""
-        with pytest.raises(ValueError, match="convergence_threshold must be positive"):
-            DisplacementConfig(convergence_threshold=-0.01)
-    
-    def test_config_negative_coordinate_precision_raises_error(self):
-        """Test that negative coordinate_precision raises ValueError."""
-        with pytest.raises(ValueError, match="coordinate_precision cannot be negative"):
-            DisplacementConfig(coordinate_precision=-1)
+    @pytest.mark.parametrize(
+        "kwargs,msg",
+        [
+            (dict(min_distance=-10.0), "min_distance must be positive"),
+            (dict(min_distance=0.0), "min_distance must be positive"),
+            (dict(max_displacement=-50.0), "max_displacement must be positive"),
+            (dict(strategy="invalid"), "strategy must be"),
+            (dict(energy_alpha=1.5), "energy_alpha must be between 0 and 1"),
+            (dict(energy_alpha=-0.1), "energy_alpha must be between 0 and 1"),
+            (dict(energy_beta=1.5), "energy_beta must be between 0 and 1"),
+            (dict(energy_beta=-0.1), "energy_beta must be between 0 and 1"),
+            (dict(max_iterations=-10), "max_iterations must be positive"),
+            (dict(convergence_threshold=-0.01), "convergence_threshold must be positive"),
+            (dict(coordinate_precision=-1), "coordinate_precision cannot be negative"),
+        ],
+        ids=[
+            "negative_min_distance",
+            "zero_min_distance",
+            "negative_max_displacement",
+            "invalid_strategy",
+            "energy_alpha_above_range",
+            "energy_alpha_below_range",
+            "energy_beta_above_range",
+            "energy_beta_below_range",
+            "negative_max_iterations",
+            "negative_convergence_threshold",
+            "negative_coordinate_precision",
+        ],
+    )
+    def test_invalid_config_raises_error(self, kwargs, msg):
+        """Test that each out-of-range setting raises ValueError."""
+        with pytest.raises(ValueError, match=msg):
+            DisplacementConfig(**kwargs)
     
     def test_config_all_strategies_valid(self):
         """Test that all documented strategies are valid."""
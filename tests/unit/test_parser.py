@@ -4,20 +4,33 @@ Unit tests for WKT Parser component.
 Tests the parsing of WKT LINESTRING geometries from strings and files.
 """
 
+import io
 import pytest
 import tempfile
 import os
 from pathlib import Path
+import shapely
 
 from cartographic_displacement import WKTParser, WKTParseError, LineSegment, Point
 
 
+@pytest.fixture(scope="class")
+def parser():
+    """Parser shared by every test in a class."""
+    return WKTParser()
+
+
+@pytest.fixture(autouse=True)
+def reset_parser(parser):
+    """Restart segment IDs at 0 for each test."""
+    parser.reset_id_counter()
+
+
 class TestWKTParser:
     """Test suite for WKTParser class."""
     
-    def test_parse_simple_linestring(self):
+    def test_parse_simple_linestring(self, parser):
         """Test parsing a simple valid LINESTRING."""
-        parser = WKTParser()
         wkt = "LINESTRING (0 0, 1 1, 2 0)"
         
         segment = parser.parse_linestring(wkt)
@@ -29,9 +42,8 @@ class TestWKTParser:
         assert segment.coordinates[1] == Point(1, 1)
         assert segment.coordinates[2] == Point(2, 0)
     
-    def test_parse_linestring_case_insensitive(self):
+    def test_parse_linestring_case_insensitive(self, parser):
         """Test that parsing is case-insensitive."""
-        parser = WKTParser()
         wkt_lower = "linestring (0 0, 1 1)"
         wkt_upper = "LINESTRING (0 0, 1 1)"
         wkt_mixed = "LineString (0 0, 1 1)"
@@ -45,9 +57,8 @@ class TestWKTParser:
         assert len(seg1.coordinates) == len(seg2.coordinates) == len(seg3.coordinates)
         assert seg1.coordinates[0] == seg2.coordinates[0] == seg3.coordinates[0]
     
-    def test_parse_linestring_with_whitespace(self):
+    def test_parse_linestring_with_whitespace(self, parser):
         """Test parsing LINESTRING with various whitespace."""
-        parser = WKTParser()
         wkt = "LINESTRING  (  0  0  ,  1  1  ,  2  0  )"
         
         segment = parser.parse_linestring(wkt)
@@ -55,9 +66,8 @@ class TestWKTParser:
         assert len(segment.coordinates) == 3
         assert segment.coordinates[0] == Point(0, 0)
     
-    def test_parse_linestring_multiline(self):
+    def test_parse_linestring_multiline(self, parser):
         """Test parsing LINESTRING with coordinates on multiple lines."""
-        parser = WKTParser()
         wkt = """LINESTRING (
             0 0,
             1 1,
@@ -70,9 +80,8 @@ class TestWKTParser:
         assert segment.coordinates[0] == Point(0, 0)
         assert segment.coordinates[2] == Point(2, 0)
     
-    def test_parse_linestring_with_decimals(self):
+    def test_parse_linestring_with_decimals(self, parser):
         """Test parsing LINESTRING with decimal coordinates."""
-        parser = WKTParser()
         wkt = "LINESTRING (0.5 1.25, 2.75 3.125, 4.0 5.5)"
         
         segment = parser.parse_linestring(wkt)
@@ -82,9 +91,8 @@ class TestWKTParser:
         assert segment.coordinates[1] == Point(2.75, 3.125)
         assert segment.coordinates[2] == Point(4.0, 5.5)
     
-    def test_parse_linestring_with_negative_coords(self):
+    def test_parse_linestring_with_negative_coords(self, parser):
         """Test parsing LINESTRING with negative coordinates."""
-        parser = WKTParser()
         wkt = "LINESTRING (-10 -20, 0 0, 10 20)"
         
         segment = parser.parse_linestring(wkt)
@@ -93,9 +101,8 @@ class TestWKTParser:
         assert segment.coordinates[1] == Point(0, 0)
         assert segment.coordinates[2] == Point(10, 20)
     
-    def test_parse_linestring_invalid_keyword(self):
+    def test_parse_linestring_invalid_keyword(self, parser):
         """Test that invalid geometry type raises error."""
-        parser = WKTParser()
         wkt = "POLYGON ((0 0, 1 1, 2 0, 0 0))"
         
         with pytest.raises(WKTParseError) as exc_info:
@@ -103,18 +110,16 @@ class TestWKTParser:
         
         assert "Expected 'LINESTRING'" in str(exc_info.value)
     
-    def test_parse_linestring_empty_string(self):
+    def test_parse_linestring_empty_string(self, parser):
         """Test that empty string raises error."""
-        parser = WKTParser()
         
         with pytest.raises(WKTParseError) as exc_info:
             parser.parse_linestring("")
         
         assert "Expected 'LINESTRING'" in str(exc_info.value)
     
-    def test_parse_linestring_unbalanced_parentheses(self):
+    def test_parse_linestring_unbalanced_parentheses(self, parser):
         """Test that unbalanced parentheses raise error."""
-        parser = WKTParser()
         wkt = "LINESTRING (0 0, 1 1"
         
         with pytest.raises(WKTParseError) as exc_info:
@@ -122,9 +127,8 @@ class TestWKTParser:
         
         assert "Unbalanced parentheses" in str(exc_info.value)
     
-    def test_parse_linestring_too_few_points(self):
+    def test_parse_linestring_too_few_points(self, parser):
         """Test that LINESTRING with only 1 point raises error."""
-        parser = WKTParser()
         wkt = "LINESTRING (0 0)"
         
         with pytest.raises(WKTParseError) as exc_info:
@@ -132,9 +136,8 @@ class TestWKTParser:
         
         assert "at least 2 points" in str(exc_info.value)
     
-    def test_parse_linestring_empty_coords(self):
+    def test_parse_linestring_empty_coords(self, parser):
         """Test that LINESTRING EMPTY raises error."""
-        parser = WKTParser()
         wkt = "LINESTRING EMPTY"
         
         with pytest.raises(WKTParseError) as exc_info:
@@ -142,9 +145,8 @@ class TestWKTParser:
         
         assert "empty" in str(exc_info.value).lower()
     
-    def test_parse_linestring_invalid_coordinates(self):
+    def test_parse_linestring_invalid_coordinates(self, parser):
         """Test that invalid coordinate format raises error."""
-        parser = WKTParser()
         wkt = "LINESTRING (0 0, abc def, 2 0)"
         
         with pytest.raises(WKTParseError) as exc_info:
@@ -152,9 +154,19 @@ class TestWKTParser:
         
         assert "Invalid WKT syntax" in str(exc_info.value)
     
-    def test_parse_linestring_missing_comma(self):
+    @pytest.mark.parametrize("wkt", [
+        "LINESTRING (\u0663 0, 1 1)",
+        "LINESTRING (0 0,\u00a01 1)",
+    ], ids=["arabic_indic_digit", "no_break_space"])
+    def test_parse_linestring_rejects_non_ascii_syntax(self, parser, wkt):
+        """Test that non-ASCII digits and spaces are rejected like Shapely does."""
+        with pytest.raises(WKTParseError) as exc_info:
+            parser.parse_linestring(wkt)
+        
+        assert "Invalid WKT syntax" in str(exc_info.value)
+    
+    def test_parse_linestring_missing_comma(self, parser):
         """Test that missing comma between coordinates raises error."""
-        parser = WKTParser()
         wkt = "LINESTRING (0 0 1 1 2 0)"
         
         with pytest.raises(WKTParseError) as exc_info:
@@ -163,9 +175,8 @@ class TestWKTParser:
         # This should be caught by Shapely as invalid syntax
         assert "Invalid" in str(exc_info.value)
     
-    def test_segment_id_increments(self):
+    def test_segment_id_increments(self, parser):
         """Test that segment IDs increment correctly."""
-        parser = WKTParser()
         
         seg1 = parser.parse_linestring("LINESTRING (0 0, 1 1)")
         seg2 = parser.parse_linestring("LINESTRING (2 2, 3 3)")
@@ -175,9 +186,8 @@ class TestWKTParser:
         assert seg2.id == 1
         assert seg3.id == 2
     
-    def test_reset_id_counter(self):
+    def test_reset_id_counter(self, parser):
         """Test that ID counter can be reset."""
-        parser = WKTParser()
         
         seg1 = parser.parse_linestring("LINESTRING (0 0, 1 1)")
         assert seg1.id == 0
@@ -187,36 +197,29 @@ class TestWKTParser:
         seg2 = parser.parse_linestring("LINESTRING (2 2, 3 3)")
         assert seg2.id == 0
     
-    def test_parse_file_simple(self):
+    def test_parse_file_simple(self, parser):
         """Test parsing a simple file with multiple LINESTRING entries."""
-        parser = WKTParser()
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.wkt') as f:
-            f.write("LINESTRING (0 0, 1 1, 2 0)\n")
-            f.write("LINESTRING (3 3, 4 4, 5 3)\n")
-            f.write("LINESTRING (6 6, 7 7)\n")
-            temp_path = f.name
-        
-        try:
-            segments = parser.parse_file(temp_path)
-            
-            assert len(segments) == 3
-            assert segments[0].id == 0
-            assert segments[1].id == 1
-            assert segments[2].id == 2
-            assert len(segments[0].coordinates) == 3
-            assert len(segments[1].coordinates) == 3
-            assert len(segments[2].coordinates) == 2
-        finally:
-            os.unlink(temp_path)
+        source = io.StringIO(
+            "LINESTRING (0 0, 1 1, 2 0)\n"
+            "LINESTRING (3 3, 4 4, 5 3)\n"
+            "LINESTRING (6 6, 7 7)\n"
+        )
+        
+        segments = parser.parse_file(source)
+        
+        assert len(segments) == 3
+        assert segments[0].id == 0
+        assert segments[1].id == 1
+        assert segments[2].id == 2
+        assert len(segments[0].coordinates) == 3
+        assert len(segments[1].coordinates) == 3
+        assert len(segments[2].coordinates) == 2
     
-    def test_parse_file_multiline_coordinates(self):
+    def test_parse_file_multiline_coordinates(self, parser):
         """Test parsing file with multi-line coordinate lists."""
-        parser = WKTParser()
         
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.wkt') as f:
-            f.write("""LINESTRING (
+        source = io.StringIO("""LINESTRING (
                 0 0,
                 1 1,
                 2 0
@@ -225,48 +228,38 @@ class TestWKTParser:
                 3 3,
                 4 4
             )""")
-            temp_path = f.name
         
-        try:
-            segments = parser.parse_file(temp_path)
-            
-            assert len(segments) == 2
-            assert len(segments[0].coordinates) == 3
-            assert len(segments[1].coordinates) == 2
-        finally:
-            os.unlink(temp_path)
+        segments = parser.parse_file(source)
+        
+        assert len(segments) == 2
+        assert len(segments[0].coordinates) == 3
+        assert len(segments[1].coordinates) == 2
     
-    def test_parse_file_with_comments_and_whitespace(self):
+    def test_parse_file_with_comments_and_whitespace(self, parser):
         """Test parsing file with extra whitespace (comments not supported by WKT)."""
-        parser = WKTParser()
         
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.wkt') as f:
-            f.write("\n\n")
-            f.write("LINESTRING (0 0, 1 1)\n")
-            f.write("\n")
-            f.write("LINESTRING (2 2, 3 3)\n")
-            f.write("\n\n")
-            temp_path = f.name
+        source = io.StringIO(
+            "\n\n"
+            "LINESTRING (0 0, 1 1)\n"
+            "\n"
+            "LINESTRING (2 2, 3 3)\n"
+            "\n\n"
+        )
         
-        try:
-            segments = parser.parse_file(temp_path)
-            
-            assert len(segments) == 2
-        finally:
-            os.unlink(temp_path)
+        segments = parser.parse_file(source)
+        
+        assert len(segments) == 2
     
-    def test_parse_file_not_found(self):
+    def test_parse_file_not_found(self, parser):
         """Test that non-existent file raises FileNotFoundError."""
-        parser = WKTParser()
         
         with pytest.raises(FileNotFoundError) as exc_info:
             parser.parse_file("/nonexistent/path/to/file.wkt")
         
         assert "not found" in str(exc_info.value).lower()
     
-    def test_parse_file_empty(self):
+    def test_parse_file_empty(self, parser):
         """Test that empty file raises error."""
-        parser = WKTParser()
         
         with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.wkt') as f:
             # Write nothing
@@ -280,57 +273,172 @@ class TestWKTParser:
         finally:
             os.unlink(temp_path)
     
-    def test_parse_file_no_linestrings(self):
+    def test_parse_file_no_linestrings(self, parser):
         """Test that file with no LINESTRING geometries raises error."""
-        parser = WKTParser()
         
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.wkt') as f:
-            f.write("POINT (0 0)\n")
-            f.write("POLYGON ((0 0, 1 1, 1 0, 0 0))\n")
+        source = io.StringIO(
+            "POINT (0 0)\n"
+            "POLYGON ((0 0, 1 1, 1 0, 0 0))\n"
+        )
+        
+        with pytest.raises(WKTParseError) as exc_info:
+            parser.parse_file(source)
+        
+        assert "No valid LINESTRING" in str(exc_info.value)
+    
+    def test_parse_file_with_invalid_linestring(self, parser):
+        """Test that file with invalid LINESTRING raises error with line number."""
+        
+        source = io.StringIO(
+            "LINESTRING (0 0, 1 1)\n"
+            "LINESTRING (2 2, abc def)\n"  # Invalid
+            "LINESTRING (3 3, 4 4)\n"
+        )
+        
+        with pytest.raises(WKTParseError) as exc_info:
+            parser.parse_file(source)
+        
+        error_msg = str(exc_info.value)
+        assert "Line" in error_msg  # Should include line number
+        assert "Invalid WKT syntax" in error_msg
+    
+    def test_parse_file_error_reports_exact_line(self, parser):
+        """Test that the reported line number is the line where the match starts."""
+        
+        source = io.StringIO(
+            "LINESTRING (0 0,\n  1 1)\n"
+            "\n"
+            "  LINESTRING (2 2, abc def)\n"  # Invalid, starts on line 4
+        )
+        
+        with pytest.raises(WKTParseError) as exc_info:
+            parser.parse_file(source)
+        
+        assert exc_info.value.line_number == 4
+    
+    def test_parse_file_error_line_after_non_ascii_text(self, parser):
+        """Test that multi-byte characters do not shift reported line numbers."""
+        
+        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', delete=False, suffix='.wkt') as f:
+            f.write("# Straße — Zürich ✓\n")
+            f.write("LINESTRING (0 0, 1 1)\n")
+            f.write("LINESTRING (2 2, abc def)\n")  # Invalid, starts on line 3
             temp_path = f.name
         
         try:
             with pytest.raises(WKTParseError) as exc_info:
                 parser.parse_file(temp_path)
             
-            assert "No valid LINESTRING" in str(exc_info.value)
+            assert exc_info.value.line_number == 3
+            assert exc_info.value.wkt_string == "LINESTRING (2 2, abc def)"
         finally:
             os.unlink(temp_path)
     
-    def test_parse_file_with_invalid_linestring(self):
-        """Test that file with invalid LINESTRING raises error with line number."""
-        parser = WKTParser()
+    def test_parse_file_matches_parse_linestring(self):
+        """Test that bulk file parsing yields the same segments as per-string parsing."""
+        lines = [
+            "LINESTRING (0 0, 1 1, 2 0)",
+            "linestring(-1.5 2.25, 3 4)",
+            "LINESTRING (10 10,\n 20 20)",
+        ]
         
         with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.wkt') as f:
-            f.write("LINESTRING (0 0, 1 1)\n")
-            f.write("LINESTRING (2 2, abc def)\n")  # Invalid
-            f.write("LINESTRING (3 3, 4 4)\n")
+            f.write("\n".join(lines) + "\n")
             temp_path = f.name
         
         try:
-            with pytest.raises(WKTParseError) as exc_info:
-                parser.parse_file(temp_path)
-            
-            error_msg = str(exc_info.value)
-            assert "Line" in error_msg  # Should include line number
-            assert "Invalid WKT syntax" in error_msg
+            from_file = WKTParser().parse_file(temp_path)
         finally:
             os.unlink(temp_path)
+        
+        single = WKTParser()
+        expected = [single.parse_linestring(line) for line in lines]
+        
+        assert [s.id for s in from_file] == [s.id for s in expected]
+        assert [s.coordinates for s in from_file] == [s.coordinates for s in expected]
     
-    def test_shapely_geometry_created(self):
+    def test_threaded_parse_matches_serial(self, monkeypatch):
+        """Test that parsing across threads preserves order and validity."""
+        from cartographic_displacement import _parallel, parser as parser_module
+        
+        wkt_strings = [f"LINESTRING ({i} 0, {i} 1)" for i in range(20)]
+        wkt_strings[7] = "LINESTRING (7 0, abc def)"
+        serial_geoms, serial_valid = WKTParser()._bulk_parse(wkt_strings)
+        
+        monkeypatch.setattr(parser_module, "PARALLEL_MIN_STRINGS", 1)
+        monkeypatch.setattr(_parallel.os, "cpu_count", lambda: 4)
+        threaded_geoms, threaded_valid = WKTParser()._bulk_parse(wkt_strings)
+        
+        assert threaded_valid.tolist() == serial_valid.tolist()
+        assert not threaded_valid[7]
+        assert [g.wkt for g in threaded_geoms[threaded_valid]] == \
+            [g.wkt for g in serial_geoms[serial_valid]]
+    
+    def test_parse_file_rejects_3d_linestring(self, parser):
+        """Test that 3D coordinates are rejected when parsing from a file."""
+        source = io.BytesIO(
+            b"LINESTRING (0 0, 1 1)\n"
+            b"LINESTRING (0 0 0, 1 1 1)\n"
+        )
+        
+        with pytest.raises(WKTParseError) as exc_info:
+            parser.parse_file(source)
+        assert exc_info.value.line_number == 2
+    
+    def test_parse_file_crlf_line_endings(self, parser):
+        """Test that CRLF line endings do not leak into parsed WKT strings."""
+        source = io.BytesIO(
+            b"LINESTRING (0 0,\r\n 1 1)\r\n"
+            b"LINESTRING (2 2,\r\n abc def)\r\n"
+        )
+        
+        with pytest.raises(WKTParseError) as exc_info:
+            parser.parse_file(source)
+        assert exc_info.value.line_number == 3
+        assert exc_info.value.wkt_string == "LINESTRING (2 2,\n abc def)"
+        assert '\r' not in str(exc_info.value)
+    
+    def test_shapely_geometry_created(self, parser):
         """Test that Shapely geometry is properly created."""
-        parser = WKTParser()
         wkt = "LINESTRING (0 0, 1 1, 2 0)"
         
         segment = parser.parse_linestring(wkt)
         
-        assert segment.shapely_geom is not None
-        assert segment.shapely_geom.geom_type == "LineString"
+        assert isinstance(segment.shapely_geom, shapely.LineString)
         assert segment.shapely_geom.length > 0
     
-    def test_segment_length_calculation(self):
+    def test_plain_linestring_skips_shapely_until_needed(self, parser):
+        """Test that plain 2D coordinates are read without building a geometry."""
+        wkt = "LINESTRING (0 0, 1.5e2 -.5, +3. 4)"
+        
+        segment = parser.parse_linestring(wkt)
+        
+        assert segment._shapely_geom is None
+        assert segment.coordinates == [Point(0, 0), Point(150, -0.5), Point(3, 4)]
+        assert segment.shapely_geom.equals_exact(shapely.from_wkt(wkt), 0)
+    
+    @pytest.mark.parametrize("num_points", [2, 7, 8, 20])
+    def test_short_and_long_coordinate_lists_match_shapely(self, parser, num_points):
+        """Test that both coordinate conversion paths agree with Shapely."""
+        wkt = "LINESTRING (" + ", ".join(
+            f"{i * 1.1:.6f} {-i / 3:.17g}" for i in range(num_points)
+        ) + ")"
+        
+        segment = parser.parse_linestring(wkt)
+        
+        assert segment.xy.tolist() == shapely.get_coordinates(shapely.from_wkt(wkt)).tolist()
+    
+    def test_repeated_linestring_gets_fresh_segment(self, parser):
+        """Test that reparsing the same WKT yields an independent segment."""
+        seg1 = parser.parse_linestring("LINESTRING (0 0, 1 1)")
+        seg2 = parser.parse_linestring("linestring (0 0, 1 1)")
+        
+        assert (seg1.id, seg2.id) == (0, 1)
+        assert seg1.coordinates == seg2.coordinates
+        assert seg1.coordinates is not seg2.coordinates
+    
+    def test_segment_length_calculation(self, parser):
         """Test that segment length is calculated correctly."""
-        parser = WKTParser()
         wkt = "LINESTRING (0 0, 3 4)"  # 3-4-5 triangle, length = 5
         
         segment = parser.parse_linestring(wkt)